@@ -1,12 +1,12 @@
 # final_projet/scripts/build_imdb_catalog.py
 # Génère :
-# - data/data_processed/movies_local.csv.gz
-# - data/data_processed/movies_features.csv.gz
+# - data/data_processed/movies_local.parquet
+# - data/data_processed/movies_features.parquet
 #
 # Contraintes :
 # - Casting top 5 (actor/actress selon le champ ordering)
 # - Réalisateurs convertis en noms (mapping nconst -> primaryName)
-# - Les fichiers de sortie doivent rester < 100MB (gzip)
+# - Les fichiers de sortie doivent rester < 100MB (Parquet + zstd)
 #
 # À lancer depuis la racine du projet :
 #   python scripts/build_imdb_catalog.py
@@ -15,10 +15,16 @@ from __future__ import annotations
 
 import gzip
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Set
+from typing import Dict, List
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.feather as paf
+import pyarrow.parquet as pq
 
 
 # -----------------------------
@@ -40,14 +46,12 @@ CREW_PATH = RAW_DIR / "title.crew.tsv.gz"
 PRINCIPALS_PATH = RAW_DIR / "title.principals.tsv.gz"
 NAMES_PATH = RAW_DIR / "name.basics.tsv.gz"
 
-OUT_LOCAL = OUT_DIR / "movies_local.csv.gz"
-OUT_FEATURES = OUT_DIR / "movies_features.csv.gz"
+OUT_LOCAL = OUT_DIR / "movies_local.parquet"
+OUT_FEATURES = OUT_DIR / "movies_features.parquet"
+OUT_FEATURES_FEATHER = OUT_DIR / "movies_features.feather"
 
-CHUNK_BASICS = 500_000
-CHUNK_RATINGS = 1_000_000
-CHUNK_CREW = 1_000_000
-CHUNK_PRINCIPALS = 2_000_000
-CHUNK_NAMES = 1_000_000
+# Taille des blocs lus par le parseur CSV d'Arrow (décompression + parsing en C++)
+ARROW_BLOCK_SIZE = 64 << 20  # 64 MB
 
 
 # -----------------------------
@@ -62,21 +66,94 @@ def ensure_files_exist(paths: List[Path]) -> None:
         )
 
 
-def to_int_series(s: pd.Series) -> pd.Series:
-    """Convertit une série en entier (avec gestion des erreurs et valeurs manquantes)."""
-    return pd.to_numeric(s, errors="coerce").astype("Int64")
+def arrow_string_dtype(dtype: pa.DataType):
+    """
+    types_mapper pour to_pandas() : les colonnes texte restent adossées à
+    Arrow (string[pyarrow]) au lieu d'être converties en objets Python.
+    Mémoire ~3x moindre et opérations .str exécutées par les kernels Arrow.
+    """
+    return pd.ArrowDtype(dtype) if pa.types.is_string(dtype) else None
 
 
-def split_imdb_list(value: str) -> List[str]:
+def tconst_ids(col):
+    """
+    Encode les identifiants IMDb "tt1234567" en uint32 (partie numérique).
+    Les tests d'appartenance is_in se font alors sur des entiers de 4 octets
+    (hash entier) au lieu de chaînes : needle set ~4x plus petit, hash/compare
+    bien plus rapides sur les scans de dizaines de millions de lignes.
     """
-    Certains champs IMDb (ex: directors) peuvent être :
-    - "\\N"
-    - "nm0000001,nm0000002"
-    Cette fonction renvoie une liste d’identifiants nconst propres.
+    return pc.cast(pc.utf8_slice_codeunits(col, 2), pa.uint32())
+
+
+def open_decompressed(path: Path):
+    """
+    Ouvre un .gz via rapidgzip (décompression parallèle sur tous les coeurs)
+    quand le module est installé. Retourne None sinon : Arrow décompresse
+    alors lui-même le gzip (un seul thread zlib, le goulot sur ces fichiers).
+    """
+    if path.suffix != ".gz":
+        return None
+    try:
+        import rapidgzip
+    except ImportError:
+        return None
+    return rapidgzip.open(str(path), parallelization=os.cpu_count())
+
+
+def open_tsv_stream(path: Path, usecols: List[str], column_types: Dict[str, pa.DataType]):
     """
-    if not isinstance(value, str) or value == r"\N" or value.strip() == "":
-        return []
-    return [x.strip() for x in value.split(",") if x.strip()]
+    Ouvre un TSV IMDb (gzip ou non) en streaming via le lecteur Arrow.
+    Le parsing et la décompression se font en C++ multi-threadé ; les valeurs
+    "\\N" d'IMDb sont converties en null dès la lecture.
+    """
+    return pacsv.open_csv(
+        open_decompressed(path) or path,
+        read_options=pacsv.ReadOptions(block_size=ARROW_BLOCK_SIZE),
+        parse_options=pacsv.ParseOptions(delimiter="\t", quote_char=False),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=usecols,
+            column_types=column_types,
+            null_values=[r"\N", ""],
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def stream_filtered(path: Path, usecols, column_types, make_mask, label: str, select=None) -> pd.DataFrame:
+    """
+    Streame un TSV, filtre chaque lot via make_mask(table) et écrit les lots
+    retenus dans un Parquet temporaire (ParquetWriter) au lieu d'accumuler des
+    chunks pandas : la mémoire reste O(bloc) au lieu de O(total filtré).
+    Le fichier temporaire est relu une fois à la fin puis supprimé.
+    """
+    tmp = OUT_DIR / f".{label}_filtered.tmp.parquet"
+    writer = None
+    total_rows = 0
+
+    try:
+        for batch in open_tsv_stream(path, usecols, column_types):
+            tbl = pa.Table.from_batches([batch])
+            total_rows += len(tbl)
+
+            filtered = tbl.filter(make_mask(tbl))
+            if select is not None:
+                filtered = filtered.select(select)
+
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, filtered.schema)
+            writer.write_table(filtered)
+
+            print(f"[{label}] scanned={total_rows:,} matched_chunk={len(filtered):,}")
+
+        if writer is None:
+            return pd.DataFrame(columns=list(select or usecols))
+        writer.close()
+        writer = None
+        return pq.read_table(tmp).to_pandas(types_mapper=arrow_string_dtype)
+    finally:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
 
 
 def file_size_mb(path: Path) -> float:
@@ -97,57 +174,38 @@ def load_filtered_basics() -> pd.DataFrame:
         "runtimeMinutes",
         "genres",
     ]
-    dtypes = {
-        "tconst": "string",
-        "titleType": "string",
-        "primaryTitle": "string",
-        "isAdult": "Int64",
-        "startYear": "string",
-        "runtimeMinutes": "string",
-        "genres": "string",
+    column_types = {
+        "tconst": pa.string(),
+        "titleType": pa.string(),
+        "primaryTitle": pa.string(),
+        "isAdult": pa.int8(),
+        # int16 suffit pour des années et des durées : colonnes 2x plus étroites
+        "startYear": pa.int16(),
+        "runtimeMinutes": pa.int16(),
+        "genres": pa.string(),
     }
 
-    chunks = []
-    total_rows = 0
-
-    for chunk in pd.read_csv(
+    def make_mask(tbl: pa.Table):
+        # Filtres Option A (kernels Arrow ; les nulls sont éliminés par filter())
+        mask = pc.equal(tbl["titleType"], "movie")
+        mask = pc.and_kleene(mask, pc.equal(pc.fill_null(tbl["isAdult"], 1), 0))
+        # Les "" et "\N" sont déjà convertis en null par le lecteur (null_values) :
+        # is_valid suffit, pas besoin d'une passe de trim sur 10M de titres
+        mask = pc.and_kleene(mask, pc.is_valid(tbl["primaryTitle"]))
+        mask = pc.and_kleene(mask, pc.greater_equal(tbl["startYear"], MIN_YEAR))
+        mask = pc.and_kleene(mask, pc.greater_equal(tbl["runtimeMinutes"], RUNTIME_MIN))
+        mask = pc.and_kleene(mask, pc.less_equal(tbl["runtimeMinutes"], RUNTIME_MAX))
+        mask = pc.and_kleene(mask, pc.is_valid(tbl["genres"]))
+        return mask
+
+    basics = stream_filtered(
         BASICS_PATH,
-        sep="\t",
-        compression="gzip",
-        usecols=usecols,
-        dtype=dtypes,
-        chunksize=CHUNK_BASICS,
-        low_memory=False,
-    ):
-        total_rows += len(chunk)
-
-        # Normalisation des types
-        chunk["startYear"] = to_int_series(chunk["startYear"])
-        chunk["runtimeMinutes"] = to_int_series(chunk["runtimeMinutes"])
-
-        # Filtres Option A
-        mask = (
-            (chunk["titleType"] == "movie")
-            & (chunk["isAdult"].fillna(1) == 0)
-            & (chunk["primaryTitle"].notna())
-            & (chunk["primaryTitle"].str.strip() != "")
-            & (chunk["startYear"].notna())
-            & (chunk["startYear"] >= MIN_YEAR)
-            & (chunk["runtimeMinutes"].notna())
-            & (chunk["runtimeMinutes"] >= RUNTIME_MIN)
-            & (chunk["runtimeMinutes"] <= RUNTIME_MAX)
-            & (chunk["genres"].notna())
-            & (chunk["genres"] != r"\N")
-        )
-
-        filtered = chunk.loc[
-            mask, ["tconst", "primaryTitle", "startYear", "runtimeMinutes", "genres"]
-        ]
-        chunks.append(filtered)
-
-        print(f"[basics] scanned={total_rows:,} kept_chunk={len(filtered):,}")
-
-    basics = pd.concat(chunks, ignore_index=True)
+        usecols,
+        column_types,
+        make_mask,
+        label="basics",
+        select=["tconst", "primaryTitle", "startYear", "runtimeMinutes", "genres"],
+    )
     basics = basics.drop_duplicates(subset=["tconst"])
     print(f"[basics] kept_total={len(basics):,}")
     return basics
@@ -156,31 +214,24 @@ def load_filtered_basics() -> pd.DataFrame:
 # -----------------------------
 # Étape 2 : Joindre ratings + filtre par nb de votes
 # -----------------------------
-def load_ratings_for_tconst(tconst_set: Set[str]) -> pd.DataFrame:
+def load_ratings_for_tconst(tconst_index: pd.Index) -> pd.DataFrame:
     usecols = ["tconst", "averageRating", "numVotes"]
-    dtypes = {"tconst": "string", "averageRating": "float32", "numVotes": "Int64"}
+    column_types = {
+        "tconst": pa.string(),
+        "averageRating": pa.float32(),
+        "numVotes": pa.int32(),  # max IMDb ~3M votes : int32 largement suffisant
+    }
 
-    keep_chunks = []
-    total_rows = 0
+    # Hash set uint32 construit une seule fois pour le filtre is_in
+    needed = tconst_ids(pa.array(tconst_index, type=pa.string()))
 
-    for chunk in pd.read_csv(
+    # On conserve uniquement les lignes dont le tconst est dans notre catalogue filtré
+    ratings = stream_filtered(
         RATINGS_PATH,
-        sep="\t",
-        compression="gzip",
-        usecols=usecols,
-        dtype=dtypes,
-        chunksize=CHUNK_RATINGS,
-        low_memory=False,
-    ):
-        total_rows += len(chunk)
-        # On conserve uniquement les lignes dont le tconst est dans notre catalogue filtré
-        chunk = chunk[chunk["tconst"].isin(tconst_set)]
-        if len(chunk):
-            keep_chunks.append(chunk)
-        print(f"[ratings] scanned={total_rows:,} matched_chunk={len(chunk):,}")
-
-    ratings = (
-        pd.concat(keep_chunks, ignore_index=True) if keep_chunks else pd.DataFrame(columns=usecols)
+        usecols,
+        column_types,
+        lambda tbl: pc.is_in(tconst_ids(tbl["tconst"]), value_set=needed),
+        label="ratings",
     )
     print(f"[ratings] matched_total={len(ratings):,}")
     return ratings
@@ -189,29 +240,19 @@ def load_ratings_for_tconst(tconst_set: Set[str]) -> pd.DataFrame:
 # -----------------------------
 # Étape 3 : Réalisateurs (crew) : récupération des nconst
 # -----------------------------
-def load_directors_for_tconst(tconst_set: Set[str]) -> pd.DataFrame:
+def load_directors_for_tconst(tconst_index: pd.Index) -> pd.DataFrame:
     usecols = ["tconst", "directors"]
-    dtypes = {"tconst": "string", "directors": "string"}
+    column_types = {"tconst": pa.string(), "directors": pa.string()}
 
-    rows = []
-    total_rows = 0
+    needed = tconst_ids(pa.array(tconst_index, type=pa.string()))
 
-    for chunk in pd.read_csv(
+    crew = stream_filtered(
         CREW_PATH,
-        sep="\t",
-        compression="gzip",
-        usecols=usecols,
-        dtype=dtypes,
-        chunksize=CHUNK_CREW,
-        low_memory=False,
-    ):
-        total_rows += len(chunk)
-        chunk = chunk[chunk["tconst"].isin(tconst_set)]
-        if len(chunk):
-            rows.append(chunk)
-        print(f"[crew] scanned={total_rows:,} matched_chunk={len(chunk):,}")
-
-    crew = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame(columns=usecols)
+        usecols,
+        column_types,
+        lambda tbl: pc.is_in(tconst_ids(tbl["tconst"]), value_set=needed),
+        label="crew",
+    )
     print(f"[crew] matched_total={len(crew):,}")
     return crew
 
@@ -219,46 +260,35 @@ def load_directors_for_tconst(tconst_set: Set[str]) -> pd.DataFrame:
 # -----------------------------
 # Étape 4 : Casting top 5 (principals) : récupération des nconst
 # -----------------------------
-def load_cast_topn_for_tconst(tconst_set: Set[str]) -> pd.DataFrame:
+def load_cast_topn_for_tconst(tconst_index: pd.Index) -> pd.DataFrame:
     usecols = ["tconst", "ordering", "nconst", "category"]
-    dtypes = {
-        "tconst": "string",
-        "ordering": "Int64",
-        "nconst": "string",
-        "category": "string",
+    column_types = {
+        "tconst": pa.string(),
+        "ordering": pa.int32(),
+        "nconst": pa.string(),
+        # dictionary-encodé à la lecture : la comparaison actor/actress se fait
+        # sur des codes entiers, pas sur les chaînes
+        "category": pa.dictionary(pa.int32(), pa.string()),
     }
 
-    parts = []
-    total_rows = 0
+    needed = tconst_ids(pa.array(tconst_index, type=pa.string()))
+    categories = pa.array(["actor", "actress"])
 
-    for chunk in pd.read_csv(
+    def make_mask(tbl: pa.Table):
+        # On ne garde que les acteurs/actrices et uniquement les 5 premiers par ordering.
+        # Prédicat le moins cher d'abord (ordering élimine la majorité des lignes).
+        mask = pc.less_equal(tbl["ordering"], CAST_TOP_N)
+        mask = pc.and_kleene(mask, pc.is_in(tbl["category"], value_set=categories))
+        mask = pc.and_kleene(mask, pc.is_in(tconst_ids(tbl["tconst"]), value_set=needed))
+        return mask
+
+    principals = stream_filtered(
         PRINCIPALS_PATH,
-        sep="\t",
-        compression="gzip",
-        usecols=usecols,
-        dtype=dtypes,
-        chunksize=CHUNK_PRINCIPALS,
-        low_memory=False,
-    ):
-        total_rows += len(chunk)
-
-        # On ne garde que les acteurs/actrices et uniquement les 5 premiers par ordering
-        chunk = chunk[
-            (chunk["tconst"].isin(tconst_set))
-            & (chunk["category"].isin(["actor", "actress"]))
-            & (chunk["ordering"].notna())
-            & (chunk["ordering"] <= CAST_TOP_N)
-        ][["tconst", "ordering", "nconst"]]
-
-        if len(chunk):
-            parts.append(chunk)
-
-        print(f"[principals] scanned={total_rows:,} matched_chunk={len(chunk):,}")
-
-    principals = (
-        pd.concat(parts, ignore_index=True)
-        if parts
-        else pd.DataFrame(columns=["tconst", "ordering", "nconst"])
+        usecols,
+        column_types,
+        make_mask,
+        label="principals",
+        select=["tconst", "ordering", "nconst"],
     )
     print(f"[principals] matched_total={len(principals):,}")
 
@@ -270,37 +300,143 @@ def load_cast_topn_for_tconst(tconst_set: Set[str]) -> pd.DataFrame:
 # -----------------------------
 # Étape 5 : Construire le mapping nconst -> primaryName (uniquement pour les personnes utiles)
 # -----------------------------
-def build_name_map(needed_nconst: Set[str]) -> Dict[str, str]:
+def build_name_map(needed_nconst: pd.Index) -> pd.Series:
+    """
+    Retourne une Series string[pyarrow] indexée par nconst (valeur = primaryName).
+    Les lookups aval passent par .map(Series) : un take/hash vectorisé en C++
+    au lieu d'un appel Python par ligne sur un dict d'un million d'entrées.
+    """
     usecols = ["nconst", "primaryName"]
-    dtypes = {"nconst": "string", "primaryName": "string"}
+    column_types = {"nconst": pa.string(), "primaryName": pa.string()}
 
-    mapping: Dict[str, str] = {}
-    total_rows = 0
+    needed = pa.array(needed_nconst, type=pa.string())
 
-    for chunk in pd.read_csv(
-        NAMES_PATH,
-        sep="\t",
-        compression="gzip",
-        usecols=usecols,
-        dtype=dtypes,
-        chunksize=CHUNK_NAMES,
-        low_memory=False,
-    ):
-        total_rows += len(chunk)
-        chunk = chunk[chunk["nconst"].isin(needed_nconst)]
-        if len(chunk):
-            for nconst, pname in zip(chunk["nconst"].tolist(), chunk["primaryName"].tolist()):
-                if pd.notna(nconst) and pd.notna(pname):
-                    mapping[str(nconst)] = str(pname)
+    def matched(batch: pa.RecordBatch) -> pa.Table:
+        tbl = pa.Table.from_batches([batch])
+        return tbl.filter(
+            pc.and_kleene(
+                pc.is_in(tbl["nconst"], value_set=needed), pc.is_valid(tbl["primaryName"])
+            )
+        )
 
-        print(f"[names] scanned={total_rows:,} found_chunk={len(chunk):,} mapped={len(mapping):,}")
+    # Un seul scan fusionné : filtre Arrow par batch, concat à la fin.
+    # Pas d'arrêt anticipé ni de compteurs : l'essentiel du fichier doit de
+    # toute façon être scanné (les nconst recherchés sont dispersés).
+    chunks = [matched(b) for b in open_tsv_stream(NAMES_PATH, usecols, column_types)]
+    names = pa.concat_tables(chunks)
 
-        # Arrêt anticipé si tout est mappé (au mieux)
-        if len(mapping) >= len(needed_nconst):
-            break
+    print(f"[names] needed={len(needed_nconst):,} mapped={len(names):,}")
+    if not len(names):
+        return pd.Series(dtype="string[pyarrow]")
+    return names.to_pandas(types_mapper=arrow_string_dtype).set_index("nconst")["primaryName"]
 
-    print(f"[names] needed={len(needed_nconst):,} mapped={len(mapping):,}")
-    return mapping
+
+# -----------------------------
+# Chemin rapide : jointure complète en DuckDB (si disponible)
+# -----------------------------
+def build_catalog_duckdb() -> bool:
+    """
+    Réalise tout le pipeline (filtres + jointures + agrégations + soup) en une
+    passe SQL DuckDB directement sur les TSV.gz bruts : parsing multi-threadé,
+    pushdown des prédicats et hash-joins en C++. Retourne False si duckdb
+    n'est pas installé (le pipeline pandas/Arrow prend alors le relais).
+    """
+    try:
+        import duckdb
+    except ImportError:
+        print("[duckdb] non installé, pipeline pandas/Arrow utilisé")
+        return False
+
+    con = duckdb.connect()
+    read_tsv = "read_csv('{path}', delim='\\t', quote='', header=true, nullstr='\\N')"
+    for view, path in [
+        ("basics", BASICS_PATH),
+        ("ratings", RATINGS_PATH),
+        ("crew", CREW_PATH),
+        ("principals", PRINCIPALS_PATH),
+        ("names", NAMES_PATH),
+    ]:
+        con.sql(f"CREATE VIEW {view} AS SELECT * FROM {read_tsv.format(path=path)}")
+
+    con.sql(
+        f"""
+        CREATE TEMP TABLE movies AS
+        WITH films AS (
+            SELECT b.tconst, b.primaryTitle,
+                   CAST(b.startYear AS INTEGER) AS startYear,
+                   CAST(b.runtimeMinutes AS INTEGER) AS runtimeMinutes,
+                   b.genres,
+                   CAST(r.averageRating AS FLOAT) AS averageRating,
+                   CAST(r.numVotes AS BIGINT) AS numVotes
+            FROM basics b
+            JOIN ratings r USING (tconst)
+            WHERE b.titleType = 'movie'
+              AND COALESCE(b.isAdult, 1) = 0
+              AND b.primaryTitle IS NOT NULL AND trim(b.primaryTitle) <> ''
+              AND b.startYear >= {MIN_YEAR}
+              AND b.runtimeMinutes BETWEEN {RUNTIME_MIN} AND {RUNTIME_MAX}
+              AND b.genres IS NOT NULL
+              AND r.numVotes >= {MIN_VOTES}
+        ),
+        director_ids AS (
+            SELECT c.tconst,
+                   unnest(string_split(c.directors, ',')) AS nconst,
+                   generate_subscripts(string_split(c.directors, ','), 1) AS ord
+            FROM crew c
+            JOIN films USING (tconst)
+        ),
+        director_names AS (
+            SELECT d.tconst,
+                   string_agg(n.primaryName, '|' ORDER BY d.ord) AS director_names
+            FROM director_ids d
+            JOIN names n USING (nconst)
+            GROUP BY d.tconst
+        ),
+        cast_names AS (
+            SELECT p.tconst,
+                   string_agg(n.primaryName, '|' ORDER BY p.ordering) AS cast_names_top5
+            FROM principals p
+            JOIN names n USING (nconst)
+            JOIN films USING (tconst)
+            WHERE p.category IN ('actor', 'actress') AND p.ordering <= {CAST_TOP_N}
+            GROUP BY p.tconst
+        )
+        SELECT f.tconst, f.primaryTitle, f.startYear, f.runtimeMinutes, f.genres,
+               f.averageRating, f.numVotes,
+               COALESCE(d.director_names, '') AS director_names,
+               COALESCE(c.cast_names_top5, '') AS cast_names_top5
+        FROM films f
+        LEFT JOIN director_names d USING (tconst)
+        LEFT JOIN cast_names c USING (tconst)
+        """
+    )
+
+    con.sql(
+        f"COPY movies TO '{OUT_LOCAL}' (FORMAT PARQUET, COMPRESSION ZSTD)"
+    )
+    con.sql(
+        f"""
+        COPY (
+            SELECT tconst,
+                   trim(regexp_replace(
+                       lower(concat_ws(' ',
+                           replace(genres, ',', ' '),
+                           replace(director_names, '|', ' '),
+                           replace(cast_names_top5, '|', ' '))),
+                       ' +', ' ', 'g')) AS soup
+            FROM movies
+        ) TO '{OUT_FEATURES}' (FORMAT PARQUET, COMPRESSION ZSTD)
+        """
+    )
+
+    # Même cache Feather que le pipeline pandas (lecture mmap côté reco)
+    paf.write_feather(pq.read_table(OUT_FEATURES), OUT_FEATURES_FEATHER, compression="uncompressed")
+
+    n_rows = con.sql("SELECT count(*) FROM movies").fetchone()[0]
+    print(f"[write] {OUT_LOCAL}  size={file_size_mb(OUT_LOCAL):.2f} MB")
+    print(f"[write] {OUT_FEATURES}  size={file_size_mb(OUT_FEATURES):.2f} MB")
+    print(f"[done] (duckdb) movies_local rows={n_rows:,}")
+    return True
 
 
 # -----------------------------
@@ -309,63 +445,75 @@ def build_name_map(needed_nconst: Set[str]) -> Dict[str, str]:
 def main() -> None:
     ensure_files_exist([BASICS_PATH, RATINGS_PATH, CREW_PATH, PRINCIPALS_PATH, NAMES_PATH])
 
+    if build_catalog_duckdb():
+        return
+
     print("=== Étape 1/6 : Filtrage basics ===")
     basics = load_filtered_basics()
-    tconst_set = set(basics["tconst"].astype(str).tolist())
-
-    print("=== Étape 2/6 : Join ratings + filtre votes ===")
-    ratings = load_ratings_for_tconst(tconst_set)
+    tconst_index = pd.Index(basics["tconst"].unique())
+
+    print("=== Étapes 2-4/6 : ratings + crew + principals (scans en parallèle) ===")
+    # Les trois scans ne dépendent que de l'index tconst issu de basics et
+    # libèrent le GIL dans le lecteur Arrow : trois threads recouvrent la
+    # décompression/parse, le temps total tend vers max(étape) au lieu de la somme.
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        f_ratings = ex.submit(load_ratings_for_tconst, tconst_index)
+        f_crew = ex.submit(load_directors_for_tconst, tconst_index)
+        f_principals = ex.submit(load_cast_topn_for_tconst, tconst_index)
+        ratings = f_ratings.result()
+        crew = f_crew.result()
+        principals = f_principals.result()
 
     movies = basics.merge(ratings, on="tconst", how="inner")
     # Filtre sur le nombre minimal de votes
-    movies = movies[movies["numVotes"].notna() & (movies["numVotes"] >= MIN_VOTES)].copy()
-    movies["numVotes"] = movies["numVotes"].astype("int64")
-    movies["averageRating"] = movies["averageRating"].astype("float32")
-
-    # Mise à jour de tconst_set après filtre votes
-    tconst_set = set(movies["tconst"].astype(str).tolist())
+    # Les dtypes étroits (int32/float32/int16) sont déjà posés à la lecture :
+    # aucun recast ni copie défensive nécessaires après le filtre
+    movies = movies[movies["numVotes"].notna() & (movies["numVotes"] >= MIN_VOTES)]
+
+    # Mise à jour de l'index tconst après filtre votes ; crew/principals ayant
+    # été scannés avant ce filtre, on les restreint au catalogue final pour ne
+    # pas chercher des noms de films éliminés.
+    tconst_index = pd.Index(movies["tconst"].unique())
+    crew = crew[crew["tconst"].isin(tconst_index)]
+    principals = principals[principals["tconst"].isin(tconst_index)]
     print(f"[catalog] after votes filter kept_total={len(movies):,}")
 
-    print("=== Étape 3/6 : Réalisateurs (crew) ===")
-    crew = load_directors_for_tconst(tconst_set)
-
-    print("=== Étape 4/6 : Casting top 5 (principals) ===")
-    principals = load_cast_topn_for_tconst(tconst_set)
-
-    # Collecte des nconst nécessaires (réalisateurs + casting)
-    director_nconst: Set[str] = set()
-    for s in crew["directors"].astype(str).tolist():
-        director_nconst.update(split_imdb_list(s))
-
-    cast_nconst: Set[str] = set(principals["nconst"].astype(str).tolist())
-    needed_nconst = director_nconst.union(cast_nconst)
+    # Collecte des nconst nécessaires (réalisateurs + casting), sans set Python :
+    # explode vectorisé côté crew, union d'index côté pandas
+    director_index = pd.Index(
+        crew["directors"].str.split(",").explode().dropna().unique()
+    )
+    cast_index = pd.Index(principals["nconst"].dropna().unique())
+    needed_nconst = director_index.union(cast_index)
 
     print(
         f"[ids] needed_nconst_total={len(needed_nconst):,} "
-        f"(directors={len(director_nconst):,}, cast={len(cast_nconst):,})"
+        f"(directors={len(director_index):,}, cast={len(cast_index):,})"
     )
 
     print("=== Étape 5/6 : Mapping des noms (nconst -> primaryName) ===")
-    name_map = build_name_map(needed_nconst)
-
-    # Réalisateurs : mapping tconst -> director_names
-    def directors_to_names(directors_field: str) -> str:
-        ids = split_imdb_list(directors_field)
-        names = [name_map.get(i) for i in ids]
-        names = [n for n in names if n]  # suppression des valeurs manquantes
-        return "|".join(names)
-
-    crew["director_names"] = crew["directors"].apply(directors_to_names)
+    name_series = build_name_map(needed_nconst)
+
+    # Réalisateurs : mapping tconst -> director_names, vectorisé via
+    # split + explode + lookup dans une Series indexée par nconst
+    exploded = crew["directors"].str.split(",").explode()
+    exploded = exploded.map(name_series).dropna()  # suppression des nconst sans nom
+    crew["director_names"] = (
+        exploded.groupby(level=0).agg("|".join).reindex(crew.index, fill_value="")
+    )
     crew = crew[["tconst", "director_names"]]
 
     # Casting : mapping des nconst en noms puis agrégation par tconst dans l’ordre
-    principals["actor_name"] = principals["nconst"].map(name_map).fillna("")
+    principals["actor_name"] = principals["nconst"].map(name_series).fillna("")
     principals = principals[principals["actor_name"].str.strip() != ""].copy()
 
+    # Le loader a déjà restreint à ordering <= CAST_TOP_N et trié : l'agrégation
+    # se réduit à une jointure de chaînes par groupe (fast path cython),
+    # sans lambda Python ni slice [:5] par film.
     cast_agg = (
         principals.sort_values(["tconst", "ordering"], kind="mergesort")
-        .groupby("tconst")["actor_name"]
-        .apply(lambda s: "|".join(s.tolist()[:CAST_TOP_N]))
+        .groupby("tconst", sort=False)["actor_name"]
+        .agg("|".join)
         .reset_index()
         .rename(columns={"actor_name": "cast_names_top5"})
     )
@@ -390,37 +538,37 @@ def main() -> None:
             "director_names",
             "cast_names_top5",
         ]
-    ].copy()
-
-    movies["startYear"] = movies["startYear"].astype("int32")
-    movies["runtimeMinutes"] = movies["runtimeMinutes"].astype("int32")
-
-    # Construction des features (tconst + soup)
-    def build_soup(row: pd.Series) -> str:
-        # genres du type "Action,Drama" -> on remplace les virgules par des espaces
-        parts = [
-            str(row["genres"]).replace(",", " "),
-            str(row["director_names"]).replace("|", " "),
-            str(row["cast_names_top5"]).replace("|", " "),
-        ]
-        soup = " ".join(parts).strip().lower()
-        # Normalisation des espaces
-        soup = " ".join(soup.split())
-        return soup
+    ]
+
+    # Construction des features (tconst + soup), entièrement vectorisée :
+    # genres "Action,Drama" -> espaces, noms "a|b" -> espaces, minuscule,
+    # puis normalisation des espaces via split/join.
+    soup = (
+        movies["genres"].str.replace(",", " ", regex=False)
+        + " "
+        + movies["director_names"].astype("string[pyarrow]").str.replace("|", " ", regex=False)
+        + " "
+        + movies["cast_names_top5"].astype("string[pyarrow]").str.replace("|", " ", regex=False)
+    )
+    soup = soup.str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
 
     features = pd.DataFrame(
         {
             "tconst": movies["tconst"].astype("string"),
-            "soup": movies.apply(build_soup, axis=1).astype("string"),
+            "soup": soup.astype("string"),
         }
     )
 
-    # Écriture des CSV compressés gzip
-    movies.to_csv(OUT_LOCAL, index=False, compression="gzip")
-    features.to_csv(OUT_FEATURES, index=False, compression="gzip")
+    # Écriture en Parquet + zstd : plus rapide à écrire et à relire que du CSV gzip
+    movies.to_parquet(OUT_LOCAL, index=False, compression="zstd")
+    features.to_parquet(OUT_FEATURES, index=False, compression="zstd")
+    # Cache Feather non compressé en plus du Parquet : build_reco_artifacts le
+    # lit en mmap zéro-copie (ni décompression ni re-parsing des chaînes)
+    features.reset_index(drop=True).to_feather(OUT_FEATURES_FEATHER, compression="uncompressed")
 
     print(f"[write] {OUT_LOCAL}  size={file_size_mb(OUT_LOCAL):.2f} MB")
     print(f"[write] {OUT_FEATURES}  size={file_size_mb(OUT_FEATURES):.2f} MB")
+    print(f"[write] {OUT_FEATURES_FEATHER}  size={file_size_mb(OUT_FEATURES_FEATHER):.2f} MB")
     print(f"[done] movies_local rows={len(movies):,} | movies_features rows={len(features):,}")
 
 
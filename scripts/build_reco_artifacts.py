@@ -3,26 +3,31 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import joblib
-from sklearn.feature_extraction.text import TfidfVectorizer
+from joblib import Parallel, delayed
+from scipy.sparse import save_npz, vstack
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import normalize
 
 DATA_PROCESSED = Path("data/data_processed")
-FEATURES_PATH = DATA_PROCESSED / "movies_features.csv.gz"
+FEATURES_PATH = DATA_PROCESSED / "movies_features.parquet"
+FEATURES_FEATHER_PATH = DATA_PROCESSED / "movies_features.feather"
 OUT_DIR = DATA_PROCESSED / "reco"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 VECTORIZER_PATH = OUT_DIR / "tfidf_vectorizer.joblib"
-MATRIX_PATH = OUT_DIR / "tfidf_matrix.joblib"
-INDEX_PATH = OUT_DIR / "tconst_index.csv"
+MATRIX_PATH = OUT_DIR / "tfidf_matrix.npz"
+INDEX_PATH = OUT_DIR / "tconst_index.joblib"
 
 # Paramètres TF-IDF (bons réglages par défaut pour une colonne "soup")
-TFIDF_MAX_FEATURES = 120_000  # contrôle la taille du vocabulaire (réduire si besoin)
-TFIDF_NGRAM_RANGE = (1, 2)    # unigrams + bigrams (utile pour des noms/prénoms)
-TFIDF_MIN_DF = 2              # ignore les termes vus une seule fois (bruit)
-TFIDF_MAX_DF = 0.90           # ignore les tokens trop fréquents
+HASH_N_FEATURES = 1 << 20   # dimension de l'espace de hachage (pas de vocabulaire à stocker)
+TFIDF_NGRAM_RANGE = (1, 2)  # unigrams + bigrams (utile pour des noms/prénoms)
 
 
 def main() -> None:
@@ -33,8 +38,12 @@ def main() -> None:
     - la matrice TF-IDF du catalogue
     - l’index tconst dans le même ordre que les lignes de la matrice
     """
-    # Chargement des features
-    df = pd.read_csv(FEATURES_PATH)
+    # Chargement des features : le cache Feather non compressé est lu en mmap
+    # zéro-copie (bien plus rapide) ; repli sur le Parquet s'il est absent
+    if FEATURES_FEATHER_PATH.exists():
+        df = pd.read_feather(FEATURES_FEATHER_PATH, columns=["tconst", "soup"])
+    else:
+        df = pd.read_parquet(FEATURES_PATH)
     df["soup"] = df["soup"].fillna("").astype(str)
 
     # On garde uniquement les lignes valides :
@@ -44,24 +53,73 @@ def main() -> None:
     df = df[df["soup"].astype(str).str.strip() != ""].copy()
     df["tconst"] = df["tconst"].astype(str)
 
-    # Construction TF-IDF
-    vectorizer = TfidfVectorizer(
-        max_features=TFIDF_MAX_FEATURES,
+    # Construction TF-IDF par hachage : pas de vocabulaire Python à construire
+    # ni à sérialiser (une seule passe sur le corpus au lieu de deux), le
+    # pipeline expose le même .transform() pour les requêtes
+    hashing = HashingVectorizer(
+        n_features=HASH_N_FEATURES,
         ngram_range=TFIDF_NGRAM_RANGE,
-        min_df=TFIDF_MIN_DF,
-        max_df=TFIDF_MAX_DF,
-        stop_words=None,  # la soup est déjà contrôlée ; on ne retire pas de tokens
+        alternate_sign=False,
+        norm=None,  # la normalisation est portée par le TfidfTransformer
+        dtype=np.float32,  # float64 inutile pour des scores TF-IDF : matrice 2x plus petite
+    )
+    tfidf = TfidfTransformer()
+    vectorizer = make_pipeline(hashing, tfidf)
+
+    # Vectorisation par morceaux en parallèle : le HashingVectorizer est
+    # sans état (pas de vocabulaire), chaque chunk se transforme donc
+    # indépendamment puis les CSR sont empilés ; l'IDF reste ajusté
+    # globalement sur la matrice complète juste après
+    n_jobs = max(1, min(os.cpu_count() or 1, 8))
+    chunks = np.array_split(df["soup"].to_numpy(), n_jobs)
+    parts = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(hashing.transform)(chunk) for chunk in chunks
+    )
+    X = vstack(parts, format="csr")
+
+    # Comptes bruts puis IDF appliqué en place sur X.data : on évite le produit
+    # X @ diag(idf) du TfidfTransformer qui alloue une seconde matrice complète
+    # (les requêtes, 1 ligne, passent elles par le transform standard du pipeline)
+    tfidf.fit(X)
+    np.multiply(X.data, tfidf.idf_.astype(np.float32)[X.indices], out=X.data)
+    X = normalize(X, norm="l2", copy=False)
+
+    # Garde-fous : données en float32 et index en int32, la similarité cosinus
+    # étant bornée par la bande passante mémoire sur X.data/X.indices
+    assert X.dtype == np.float32, f"dtype inattendu : {X.dtype}"
+    X.indices = X.indices.astype(np.int32, copy=False)
+    X.indptr = X.indptr.astype(np.int32, copy=False)
+
+    # Contrat avec le recommender : les lignes sont normalisées L2 dès la
+    # construction (normalize in place ci-dessus), la similarité cosinus au
+    # service se réduit donc à un produit scalaire sparse, sans renormalisation
+    assert np.allclose((X[:1].multiply(X[:1])).sum(), 1.0, atol=1e-4)
+
+    # Sauvegarde des artefacts : le vectorizer en joblib, la matrice au format
+    # sparse natif scipy (npz) — pas de pickle, chargement bien plus rapide.
+    # compress=0 : le vectorizer haché est minuscule (pas de vocabulaire),
+    # la décompression zlib au démarrage ne rapportait rien
+    joblib.dump(vectorizer, VECTORIZER_PATH, compress=0)
+    # npz non compressé : les tableaux data/indices/indptr sont des npy bruts
+    # que numpy peut mapper en mémoire, pas de décompression au chargement.
+    # X est déjà en CSR depuis le HashingVectorizer : aucune conversion
+    # intermédiaire (COO ou autre) n'est nécessaire avant la sauvegarde
+    save_npz(MATRIX_PATH, X, compressed=False)
+
+    # Sauvegarde de l’index dans les deux sens (ligne -> tconst et
+    # tconst -> ligne) en joblib non compressé : chargement O(octets),
+    # sans parsing CSV ni reconstruction du dict par session.
+    # row_to_tconst en chaînes à largeur fixe (dtype U déduit) : un seul
+    # bloc contigu au lieu de ~39k objets str Python épars
+    tconst_list = df["tconst"].tolist()
+    joblib.dump(
+        {
+            "tconst_to_row": {t: i for i, t in enumerate(tconst_list)},
+            "row_to_tconst": np.asarray(tconst_list),
+        },
+        INDEX_PATH,
+        compress=0,
     )
-
-    # Entraînement + transformation : création de la matrice sparse TF-IDF
-    X = vectorizer.fit_transform(df["soup"])
-
-    # Sauvegarde des artefacts (joblib + compression pour limiter la taille)
-    joblib.dump(vectorizer, VECTORIZER_PATH, compress=3)
-    joblib.dump(X, MATRIX_PATH, compress=3)
-
-    # Sauvegarde de l’index : correspondance ligne -> tconst
-    df[["tconst"]].reset_index(drop=True).to_csv(INDEX_PATH, index=False)
 
     print(f"[OK] Vectorizer saved: {VECTORIZER_PATH}")
     print(f"[OK] Matrix saved:     {MATRIX_PATH} (shape={X.shape})")
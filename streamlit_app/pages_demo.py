@@ -12,13 +12,20 @@
 
 from __future__ import annotations
 
+import functools
+import re
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 from recommender import recommend_by_soup, recommend_by_tconst
 from tmdb_client import (
+    TTL_LISTS,
     build_now_upcoming_imdb_id_sets,
     build_soup_from_tmdb_bundle,
     get_now_playing_fr,
@@ -38,19 +45,94 @@ BACKDROP_BASE = "https://image.tmdb.org/t/p/w780"
 # =============================
 # Data
 # =============================
-@st.cache_data
+# cache_resource : le DataFrame est partagé entre les sessions (lecture seule)
+# au lieu d'être copié par utilisateur ; le Parquet évite gzip + parsing CSV
+@st.cache_resource(show_spinner=False)
 def load_movies_local() -> pd.DataFrame:
-    return pd.read_csv("data/data_processed/movies_local.csv.gz")
+    df = pd.read_parquet("data/data_processed/movies_local.parquet", engine="pyarrow")
+    # Colonnes de recherche minuscules matérialisées une fois : les contains
+    # deviennent des scans d'octets (regex=False) sans re-lower à chaque frappe
+    df["_title_lc"] = df["primaryTitle"].str.lower()
+    df["_cast_lc"] = df["cast_names_top5"].fillna("").str.lower()
+    return df
+
+
+@st.cache_resource(show_spinner=False)
+def load_tconst_to_iloc() -> Dict[str, int]:
+    """Mapping tconst -> position iloc, construit une fois par processus."""
+    df = load_movies_local()
+    return {t: i for i, t in enumerate(df["tconst"].to_numpy())}
+
+
+@st.cache_resource(show_spinner=False)
+def load_tconst_set() -> frozenset:
+    """Ensemble des tconst du catalogue, construit une fois par processus."""
+    return frozenset(load_movies_local()["tconst"].astype(str).tolist())
+
+
+@st.cache_resource(show_spinner=False)
+def load_title_trigram_index() -> Dict[str, np.ndarray]:
+    """
+    Index inversé trigramme de caractères -> positions iloc des titres qui le
+    contiennent. Construit une fois par processus : la recherche par titre
+    intersecte quelques posting lists au lieu de scanner tout le catalogue.
+    """
+    titles = load_movies_local()["_title_lc"].to_numpy()
+    postings: Dict[str, List[int]] = {}
+    for i, title in enumerate(titles):
+        if not isinstance(title, str):
+            continue
+        for j in range(len(title) - 2):
+            postings.setdefault(title[j : j + 3], []).append(i)
+    # np.unique : positions triées et dédupliquées (un titre peut répéter un trigramme)
+    return {tri: np.unique(np.asarray(rows, dtype=np.int32)) for tri, rows in postings.items()}
+
+
+def _search_titles(df: pd.DataFrame, q_lc: str) -> pd.DataFrame:
+    """
+    Filtre les titres contenant q_lc. À partir de 3 caractères, les candidats
+    sont réduits par intersection des posting lists des trigrammes de la
+    requête, puis vérifiés par un contains sur ce petit sous-ensemble ;
+    en dessous, scan classique (peu de reruns concernés).
+    """
+    if len(q_lc) < 3:
+        return df[df["_title_lc"].str.contains(q_lc, regex=False, na=False)]
+
+    index = load_title_trigram_index()
+    postings = [index.get(q_lc[j : j + 3]) for j in range(len(q_lc) - 2)]
+    if any(p is None for p in postings):
+        return df.iloc[[]]  # un trigramme absent du catalogue => aucun titre possible
+
+    # Intersection en partant de la liste la plus courte : les candidats
+    # s'effondrent dès les premières passes
+    postings.sort(key=len)
+    cands = postings[0]
+    for p in postings[1:]:
+        if len(cands) == 0:
+            break
+        cands = np.intersect1d(cands, p, assume_unique=True)
+
+    sub = df.iloc[cands]
+    return sub[sub["_title_lc"].str.contains(q_lc, regex=False, na=False)]
 
 
 @st.cache_data(show_spinner=False)
+def get_genres() -> List[str]:
+    """Univers des genres du catalogue, calculé une fois (explode vectorisé)."""
+    genres = load_movies_local()["genres"].dropna().str.split(",").explode()
+    return sorted(g for g in genres.unique().tolist() if g)
+
+
+# ttl aligné sur le cache disque de tmdb_client : sans lui, le mémo en
+# mémoire figeait les listes pour toute la durée de vie du processus
+@st.cache_data(show_spinner=False, ttl=TTL_LISTS)
 def load_now_upcoming_lists() -> Tuple[list, list]:
     now_items = get_now_playing_fr(pages=1, use_cache=True)
     up_items = get_upcoming_fr(pages=1, use_cache=True)
     return now_items, up_items
 
 
-@st.cache_data(show_spinner=False)
+@st.cache_data(show_spinner=False, ttl=TTL_LISTS)
 def load_now_upcoming_sets() -> Tuple[set, set]:
     now_ids, up_ids = build_now_upcoming_imdb_id_sets(pages_now=1, pages_upcoming=1)
     return now_ids, up_ids
@@ -66,6 +148,16 @@ def _init_state() -> None:
     st.session_state.setdefault("film_query", "")
     st.session_state.setdefault("actor_query", "")
 
+    # Préchauffage TMDB en arrière-plan dès l'entrée sur la démo : les caches
+    # st.cache_data se remplissent pendant que la page charge le catalogue,
+    # le premier rendu n'attend plus la somme (chargement local + RTT TMDB)
+    if "prefetch_started" not in st.session_state:
+        threading.Thread(
+            target=lambda: (load_now_upcoming_lists(), load_now_upcoming_sets()),
+            daemon=True,
+        ).start()
+        st.session_state["prefetch_started"] = True
+
 
 def _go(page: str) -> None:
     st.session_state["demo_page"] = page
@@ -109,6 +201,7 @@ def _backdrop(path: Optional[str]) -> Optional[str]:
     return f"{BACKDROP_BASE}{path}" if path else None
 
 
+@functools.lru_cache(maxsize=8192)
 def _short(txt: str, n: int = 80) -> str:
     t = (txt or "").strip()
     if not t:
@@ -116,10 +209,16 @@ def _short(txt: str, n: int = 80) -> str:
     return t if len(t) <= n else t[: n - 1].rstrip() + "…"
 
 
+# Séparateur précompilé : absorbe les espaces autour du | (plus de strip par élément)
+_CAST_SPLIT = re.compile(r"\s*\|\s*")
+
+
+@functools.lru_cache(maxsize=4096)
 def _dedup_cast(cast: str) -> str:
+    # Mémoïsé : appelé pour chaque carte de reco et chaque fiche, souvent
+    # avec les mêmes castings d'un rerun à l'autre
     seen, out = set(), []
-    for c in (cast or "").split("|"):
-        c = c.strip()
+    for c in _CAST_SPLIT.split((cast or "").strip()):
         if c and c.lower() not in seen:
             seen.add(c.lower())
             out.append(c)
@@ -181,15 +280,24 @@ def _render_cards(cards: List[Dict[str, Any]], key_prefix: str, cols: int = 5) -
 
 
 def _local_to_cards(df: pd.DataFrame, badge: Optional[str] = "Local") -> List[Dict[str, Any]]:
+    # zip sur les ndarrays des colonnes : pas de Series construite par ligne
+    # comme avec iterrows (ce chemin tourne à chaque rerun Home/Recherche/Fiche)
     cards: List[Dict[str, Any]] = []
-    for _, r in df.iterrows():
-        main_genre = str(r.genres).split(",")[0] if pd.notna(r.genres) else ""
+    rows = zip(
+        df["tconst"].to_numpy(),
+        df["primaryTitle"].to_numpy(),
+        df["startYear"].to_numpy(),
+        df["genres"].to_numpy(),
+        df["averageRating"].to_numpy(),
+    )
+    for tconst, title, year, genres, rating in rows:
+        main_genre = genres.split(",")[0] if isinstance(genres, str) else ""
         cards.append(
             {
                 "kind": "local",
-                "id": str(r.tconst),
-                "title": str(r.primaryTitle),
-                "subtitle": f"{int(r.startYear)} • {main_genre} • IMDb {r.averageRating}",
+                "id": str(tconst),
+                "title": str(title),
+                "subtitle": f"{int(year)} • {main_genre} • IMDb {rating}",
                 "poster": None,
                 "badge": badge,
             }
@@ -214,40 +322,91 @@ def _tmdb_to_cards(items, badge: str) -> List[Dict[str, Any]]:
     return cards
 
 
+# Pool partagé au niveau module : pas de création d'executor à chaque appel,
+# et le nombre de requêtes TMDB simultanées reste borné
+_ENRICH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tmdb_enrich")
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _enrich_by_tconsts(tconsts: Tuple[str, ...]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Enrichissements TMDB (titre FR, poster, synopsis court) pour un tuple de
+    tconst. Mémoïsé par st.cache_data : re-sélectionner le même genre ou
+    revisiter la même fiche devient une lecture de cache, plus aucun appel
+    TMDB. Les cache miss partent en parallèle via le pool partagé.
+    """
+    bundles = list(
+        _ENRICH_POOL.map(lambda t: get_or_fetch_bundle_by_imdb_id(t, use_cache=True), tconsts)
+    )
+    out: List[Optional[Dict[str, Any]]] = []
+    for bundle in bundles:
+        if not bundle:
+            out.append(None)
+            continue
+        rec = tmdb_to_display_record(bundle)
+        out.append(
+            {
+                "title_fr": (rec.get("primaryTitle") or "").strip(),
+                "poster": _poster(rec.get("poster_path")),
+                "overview": (rec.get("overview_fr") or "").strip(),
+            }
+        )
+    return out
+
+
 def _enrich_local(cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Enrichit les cartes locales via TMDB :
     - titre FR si dispo
     - poster
     - (optionnel) synopsis FR court
+    L'enrichissement est résolu via _enrich_by_tconsts, donc partagé entre
+    sessions et entre reruns pour une même liste de films.
     """
-    out: List[Dict[str, Any]] = []
-    for c in cards:
-        tconst = str(c["id"])
-        bundle = get_or_fetch_bundle_by_imdb_id(tconst, use_cache=True)
-        if bundle:
-            rec = tmdb_to_display_record(bundle)
+    enrichments = _enrich_by_tconsts(tuple(str(c["id"]) for c in cards))
+    for c, e in zip(cards, enrichments):
+        if e:
+            if e["title_fr"]:
+                c["title"] = e["title_fr"]
+            c["poster"] = e["poster"]
+            if e["overview"]:
+                c["subtitle"] = f"{c['subtitle']} • {_short(e['overview'], 70)}"
+    return cards
 
-            title_fr = (rec.get("primaryTitle") or "").strip()
-            if title_fr:
-                c["title"] = title_fr
 
-            c["poster"] = _poster(rec.get("poster_path"))
+def _day_key() -> str:
+    """Clé de cache journalière : les listes à l'affiche / bientôt bougent peu
+    à l'intérieur d'une journée, et le cache se renouvelle au changement de date."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
-            ov = (rec.get("overview_fr") or "").strip()
-            if ov:
-                c["subtitle"] = f"{c['subtitle']} • {_short(ov, 70)}"
 
-        out.append(c)
-    return out
+@st.cache_data(show_spinner=False, max_entries=512)
+def get_film_reco_cards(tconst: str, day_key: str) -> List[Dict[str, Any]]:
+    """
+    Pipeline complet d'une fiche film : reco TF-IDF -> rerank à l'affiche /
+    bientôt -> gather des 5 lignes -> enrichissement TMDB, fusionné derrière
+    un seul cache par (tconst, jour). Revisiter une fiche (flux utilisateur
+    fréquent) devient une lecture de cache au lieu de rejouer chaque étape.
+    """
+    df = load_movies_local()
+    now_ids, up_ids = load_now_upcoming_sets()
+    raw = recommend_by_tconst(tconst, top_n=30)
+    ranked = _rerank([t for (t, _) in raw], now_ids, up_ids)[:5]
+    row_of = load_tconst_to_iloc()
+    rec_df = df.iloc[[row_of[t] for t in ranked if t in row_of]]
+    return _enrich_local(_local_to_cards(rec_df, badge=None))
 
 
 def _rerank(tconsts: List[str], now_ids: set, up_ids: set) -> List[str]:
-    return (
-        [t for t in tconsts if t in now_ids]
-        + [t for t in tconsts if t in up_ids and t not in now_ids]
-        + [t for t in tconsts if t not in now_ids and t not in up_ids]
+    # Une seule passe (priorité 0 = à l'affiche, 1 = bientôt, 2 = reste) puis
+    # tri stable : l'ordre du modèle est conservé à l'intérieur de chaque palier
+    prio = np.fromiter(
+        (0 if t in now_ids else 1 if t in up_ids else 2 for t in tconsts),
+        dtype=np.int8,
+        count=len(tconsts),
     )
+    order = np.argsort(prio, kind="stable")
+    return [tconsts[i] for i in order]
 
 
 # =============================
@@ -270,7 +429,7 @@ def _page_home(df: pd.DataFrame) -> None:
     st.divider()
     st.subheader("Top 10 par genre (catalogue local)")
 
-    genres = sorted({g for gs in df["genres"] for g in str(gs).split(",") if g})
+    genres = get_genres()
     selected_genre = st.selectbox("Choisir un genre", genres, key="home_genre")
 
     top = (
@@ -307,7 +466,7 @@ def _page_search(df: pd.DataFrame) -> None:
     if film_q:
         st.subheader("Résultats films (Top 5 récents)")
 
-        res = df[df["primaryTitle"].str.contains(film_q, case=False, na=False)].copy()
+        res = _search_titles(df, film_q.lower())
         res = res.sort_values("startYear", ascending=False).head(5)
 
         if len(res) > 0:
@@ -326,7 +485,7 @@ def _page_search(df: pd.DataFrame) -> None:
     elif actor_q:
         st.subheader("Résultats acteur/actrice (Top 5 récents)")
 
-        res = df[df["cast_names_top5"].fillna("").str.contains(actor_q, case=False, na=False)].copy()
+        res = df[df["_cast_lc"].str.contains(actor_q.lower(), regex=False, na=False)]
         res = res.sort_values("startYear", ascending=False).head(5)
 
         if len(res) > 0:
@@ -364,10 +523,19 @@ def _page_film(df: pd.DataFrame) -> None:
     tconst = st.session_state.get("selected_tconst")
 
     if tmdb_id is None and tconst is None:
-        st.info("Sélectionne un film depuis Accueil/Recherche, ou choisis un film local ci-dessous.")
-        pick = st.selectbox("Film local", df["primaryTitle"].sort_values().tolist())
-        tconst_pick = df[df["primaryTitle"] == pick].iloc[0]["tconst"]
-        st.button("Ouvrir la fiche", on_click=_open_local, args=(tconst_pick,), type="primary")
+        st.info("Sélectionne un film depuis Accueil/Recherche, ou cherche un film local ci-dessous.")
+        # Filtrage par préfixe côté serveur : on n'envoie plus la liste triée
+        # de tous les titres au navigateur à chaque rerun, seulement un top 50
+        q = st.text_input("Chercher un film local", placeholder="ex: inter")
+        if q:
+            cands = df.loc[df["_title_lc"].str.startswith(q.lower(), na=False)]
+            cands = cands.sort_values("numVotes", ascending=False).head(50)
+            if len(cands) == 0:
+                st.caption("Aucun titre local ne commence par cette saisie.")
+                return
+            pick = st.selectbox("Film local", cands["primaryTitle"].tolist())
+            tconst_pick = cands[cands["primaryTitle"] == pick].iloc[0]["tconst"]
+            st.button("Ouvrir la fiche", on_click=_open_local, args=(tconst_pick,), type="primary")
         return
 
     # --------- MODE TMDB ----------
@@ -404,22 +572,22 @@ def _page_film(df: pd.DataFrame) -> None:
         st.divider()
 
         imdb_id = (rec.get("imdb_id") or "").strip()
-        if imdb_id and imdb_id in set(df["tconst"].astype(str)):
-            raw = recommend_by_tconst(imdb_id, top_n=30)
-            tconsts = [t for (t, _) in raw]
+        if imdb_id and imdb_id in load_tconst_set():
+            # Pipeline reco -> rerank -> enrichissement fusionné et mémoïsé
+            cards = get_film_reco_cards(imdb_id, _day_key())
         else:
             soup = build_soup_from_tmdb_bundle(bundle)
             raw = recommend_by_soup(soup, top_n=30)
             tconsts = [t for (t, _) in raw]
 
-        ranked = _rerank(tconsts, now_ids, up_ids)[:5]
-        rec_df = df[df["tconst"].isin(ranked)].copy()
-        order = {t: i for i, t in enumerate(ranked)}
-        rec_df["rank"] = rec_df["tconst"].map(order)
-        rec_df = rec_df.sort_values("rank")
+            # Gather direct des lignes dans l'ordre du rerank : pas de scan isin
+            # ni de copie/tri du DataFrame pour récupérer 5 lignes
+            row_of = load_tconst_to_iloc()
+            ranked = _rerank(tconsts, now_ids, up_ids)[:5]
+            rec_df = df.iloc[[row_of[t] for t in ranked if t in row_of]]
+            cards = _enrich_local(_local_to_cards(rec_df, badge=None))
 
         st.subheader("Recommandations (priorité à l'affiche / bientôt)")
-        cards = _enrich_local(_local_to_cards(rec_df, badge=None))
         _render_cards(cards, key_prefix="film_reco_tmdb")
 
         return
@@ -456,17 +624,8 @@ def _page_film(df: pd.DataFrame) -> None:
 
     st.divider()
 
-    raw = recommend_by_tconst(str(film.tconst), top_n=30)
-    tconsts = [t for (t, _) in raw]
-    ranked = _rerank(tconsts, now_ids, up_ids)[:5]
-
-    rec_df = df[df["tconst"].isin(ranked)].copy()
-    order = {t: i for i, t in enumerate(ranked)}
-    rec_df["rank"] = rec_df["tconst"].map(order)
-    rec_df = rec_df.sort_values("rank")
-
     st.subheader("Recommandations (priorité à l'affiche / bientôt)")
-    cards = _enrich_local(_local_to_cards(rec_df, badge=None))
+    cards = get_film_reco_cards(str(film.tconst), _day_key())
     _render_cards(cards, key_prefix="film_reco_local")
 
 
@@ -1,9 +1,93 @@
 # streamlit_app/pages_kpi.py
 
+import json
+
 import streamlit as st
 
 import pandas as pd
 
+
+# Parquet typé (décodage colonnaire, décompression multi-thread) au lieu de
+# gzip+CSV. cache_resource comme dans pages_demo : le DataFrame est partagé
+# entre les sessions en lecture seule (la page ne le modifie jamais), sans la
+# copie de protection que cache_data refait à chaque accès
+@st.cache_resource(show_spinner=False)
+def load_features() -> pd.DataFrame:
+    # Liste de colonnes explicite : la page n'a besoin que des 9 colonnes du
+    # catalogue final montrées dans l'aperçu ; si l'artefact s'enrichit un
+    # jour, le surplus ne sera ni décodé ni gardé en mémoire
+    return pd.read_parquet(
+        "data/data_processed/movies_local.parquet",
+        engine="pyarrow",
+        columns=[
+            "tconst",
+            "primaryTitle",
+            "startYear",
+            "runtimeMinutes",
+            "genres",
+            "averageRating",
+            "numVotes",
+            "director_names",
+            "cast_names_top5",
+        ],
+    )
+
+
+# Agrégats précalculés hors ligne (scripts/build_kpi_summary.py) : la page
+# charge ~10 nombres au lieu de recalculer les KPI sur 39k lignes par session
+@st.cache_data(show_spinner=False)
+def load_kpis() -> dict:
+    with open("data/data_processed/kpi_summary.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Les notes (~8 Ko de Markdown) vivent dans un fichier à part : le module
+# n'embarque plus ce littéral géant et le texte n'est lu qu'une fois
+@st.cache_data(show_spinner=False, persist="disk")
+def _load_notes() -> str:
+    with open("streamlit_app/notes_kpi.md", encoding="utf-8") as f:
+        return f.read()
+
+
+# Blocs de métriques statiques : une constante (label, valeur, delta) par
+# section, rendue par _metric_rows au lieu d'appels col.metric dupliqués
+INSEE_KPIS = (
+    ("Population totale", "118 000", None),
+    ("60 ans et +", "47 %", "+6 pts depuis 2011"),
+    ("Moins de 30 ans", "22 %", "-4 pts depuis 2011"),
+    ("Ménages d'une personne", "41 %", None),
+    ("Pauvreté <30 ans", "25 %", None),
+)
+
+CNC_KPIS = (
+    ("Écrans (2024)", "4", "-67 % depuis 1966"),
+    ("Entrées annuelles", "45 000", "Stable"),
+    ("Entrées / habitant", "0.35", "France : 2.8"),
+    ("Séances annuelles", "2 000", None),
+    ("Taux d'occupation", "0.25", "-50 % vs France"),
+)
+
+SOURCES_KPIS = (
+    ("Films TMDB (brut)", "309 572", None),
+    ("NB dataset", "5 fichiers", None),
+    ("Colonnes TMDB", "40", None),
+)
+
+FINAL_KPIS = (
+    ("Films IMDB (après traitement)", "38 924", None),
+    ("dataset final", "1 Fichiers", None),
+    ("Colonnes finales", "9", None),
+)
+
+
+def _metric_rows(kpis, per_row: int = 3) -> None:
+    """Affiche des métriques par rangées de per_row colonnes."""
+    for start in range(0, len(kpis), per_row):
+        row = kpis[start : start + per_row]
+        for col, (label, value, delta) in zip(st.columns(per_row), row):
+            col.metric(label, value, delta)
+
+
 def page_kpi():
 
     # ============================
@@ -18,13 +102,7 @@ def page_kpi():
     # ============================
 
     st.subheader("📊 Démographie — INSEE")
-
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Population totale", "118 000")
-    col2.metric("60 ans et +", "47 %", "+6 pts depuis 2011")
-    col3.metric("Moins de 30 ans", "22 %", "-4 pts depuis 2011")
-    col1.metric("Ménages d'une personne", "41 %")
-    col2.metric("Pauvreté <30 ans", "25 %")
+    _metric_rows(INSEE_KPIS)
 
     st.markdown("---")
 
@@ -33,13 +111,7 @@ def page_kpi():
     # ============================
 
     st.subheader("🎬 Cinéma — CNC")
-
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Écrans (2024)", "4", "-67 % depuis 1966")
-    col2.metric("Entrées annuelles", "45 000", "Stable")
-    col3.metric("Entrées / habitant", "0.35", "France : 2.8")
-    col1.metric("Séances annuelles", "2 000")
-    col2.metric("Taux d'occupation", "0.25", "-50 % vs France")
+    _metric_rows(CNC_KPIS)
 
     st.markdown("---")
 
@@ -48,27 +120,13 @@ def page_kpi():
     # ============================
 
     st.header("📦 Bases de données ")
-
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Films TMDB (brut)", "309 572")
-    col2.metric("NB dataset", "5 fichiers")
-    col3.metric("Colonnes TMDB", "40")
-
-    
-    
-
-
+    _metric_rows(SOURCES_KPIS)
 
     # ============================
     # 4) KPI APRÈS TRAITEMENT IMDB (sans df)
     # ============================
 
-    
-
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Films IMDB (après traitement)", "38 924" )
-    col2.metric( "dataset final", "1 Fichiers")
-    col3.metric("Colonnes finales", "9")
+    _metric_rows(FINAL_KPIS)
 
     st.markdown("---")
     with st.expander("Filtrage des films"):
@@ -146,28 +204,23 @@ def page_kpi():
     
     st.markdown("---")
     # ============================
-    # 5) KPI TRAITEMENT IMDB (avec df)
+    # 5) KPI TRAITEMENT IMDB
     # ============================
 
-   
-    @st.cache_data
-    def load_features():
-        return pd.read_csv("data/data_processed/movies_local.csv.gz")
+    # Le dict processing_kpi n'était jamais affiché : on montre directement
+    # les taux de complétude (gratuits, lus dans kpi_summary.json)
+    st.header("🧹 Qualité des données (après traitement)")
 
-    df = load_features()
+    kpis = load_kpis()
 
-    processing_kpi = {
-        "films_total": len(df),
-        "genres_valides": df["genres"].notna().mean() * 100,
-        "directors_valides": df["director_names"].notna().mean() * 100,
-        "casting_valide": df["cast_names_top5"].notna().mean() * 100,
-        "runtime_valide": df["runtimeMinutes"].gt(0).mean() * 100,
-        "soup_completude": 100.0,
-        "longueur_moyenne_soup": 55,
-        "vocabulaire_tfidf": "40k–60k tokens",
-    }
-
-   
+    _metric_rows(
+        (
+            ("Genres valides", f"{kpis['genres_valides']} %", None),
+            ("Réalisateurs valides", f"{kpis['directors_valides']} %", None),
+            ("Casting valide", f"{kpis['casting_valide']} %", None),
+            ("Durées valides", f"{kpis['runtime_valide']} %", None),
+        )
+    )
 
 
     # ============================
@@ -176,18 +229,15 @@ def page_kpi():
 
     st.header("🤖 Moteur de recommandation (contenu)")
 
-    reco_kpi = {
-        "films_recommandables": len(df),
-        "diversite_genres": df["genres"].str.split(",").explode().nunique(),
-        "richesse_cast": df["cast_names_top5"].str.split("|").explode().nunique(),
-        "temps_reco": "< 50 ms",
-        
-    }
-
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Films recommandables", "38 924")
-    col2.metric("Genres uniques", f"{reco_kpi['diversite_genres']}")
-    col3.metric("Acteurs uniques", f"{reco_kpi['richesse_cast']:,}")
+    # Valeurs lues directement dans le JSON précalculé : plus de dict
+    # reco_kpi intermédiaire reconstruit à chaque rerun
+    _metric_rows(
+        (
+            ("Films recommandables", f"{kpis['films_total']:,}", None),
+            ("Genres uniques", f"{kpis['diversite_genres']}", None),
+            ("Acteurs uniques", f"{kpis['richesse_cast']:,}", None),
+        )
+    )
 
     
     st.subheader("model choisie : Content-Based Recommender (TF-IDF + Cosine Similarity)")
@@ -325,8 +375,14 @@ def page_kpi():
     # 7) APERÇU DATASET
     # ============================
 
+    # Seul l'aperçu touche encore le DataFrame : son chargement est déclenché
+    # à la demande (sentinelle en session), les visiteurs qui ne déplient pas
+    # l'expander ne paient ni le Parquet ni le rendu du tableau
     st.subheader("Aperçu du dataset après nettoyage")
-    st.dataframe(df.head())
+    with st.expander("Aperçu du dataset IMDB", expanded=False):
+        if st.session_state.get("kpi_preview_loaded") or st.button("Charger l'aperçu"):
+            st.session_state["kpi_preview_loaded"] = True
+            st.dataframe(load_features().head(20))
 
 
 
@@ -336,316 +392,7 @@ def page_kpi():
     
     st.markdown("# Notes")
     st.subheader("Traitement des données & Machine Learning")
-    st.markdown(
-        """
-    ## 1. Sources de données
-
-    ### Données IMDB (brutes)
-
-    * `name.basics.tsv.gz`
-    * `title.basics.tsv.gz`
-    * `title.crew.tsv.gz`
-    * `title.principals.tsv.gz`
-    * `title.ratings.tsv.gz`
-
-    Ces fichiers constituent la base brute IMDB. Ils **ne sont jamais utilisés directement** dans Streamlit.
-
-    ### Données externes
-
-    * INSEE : démographie, ménages, pauvreté, salaires
-    * CNC : écrans, entrées, fréquentation cinéma
-    * TMDB (API) : posters, titres FR, synopsis, popularité
-
-    ---
-
-    ## 2. Nettoyage et préparation des données (offline)
-
-    ### Objectif
-
-    Construire un **catalogue films propre, léger et exploitable** pour la recommandation et l’affichage.
-
-    ### Étapes principales
-
-    1. **Filtrage des films**
-
-    * Suppression des contenus non-films (séries, épisodes)
-    * Filtrage temporel (films récents / pertinents)
-    * Seuils de votes pour garantir une base fiable
-
-    2. **Nettoyage des champs**
-
-    * Harmonisation des genres
-    * Suppression des valeurs manquantes critiques
-    * Normalisation des titres et identifiants
-
-    3. **Construction des fichiers finaux**
-
-    * `movies_local.csv.gz`
-
-        * Identifiant IMDb (`tconst`)
-        * Titre principal
-        * Année de sortie
-        * Genres
-        * Données utiles à l’affichage
-
-    * `movies_features.csv.gz`
-
-        * Identifiant IMDb
-        * Texte descriptif ("soup") pour le ML
-
-    👉 Ces étapes sont réalisées via des **scripts Python offline** (`scripts/`), jamais sur Streamlit Cloud.
-
-    ---
-
-    ## 3. Feature Engineering pour la recommandation
-
-    ### Principe de la "soup"
-
-    Chaque film est représenté par un texte combinant :
-
-    * Genres
-    * Réalisateur
-    * Acteurs principaux
-
-    Exemple (simplifié) :
-
-    ```
-    Drama Thriller nolan dicaprio hardy
-    ```
-
-    Ce format permet une vectorisation simple et efficace.
-
-    ---
-
-    ## 4. Modèle de recommandation
-
-    ### 4.1 Logique générale du Machine Learning
-
-    Le système de recommandation repose sur un **modèle de type Content-Based Filtering**. Le principe est de représenter chaque film sous forme vectorielle, à partir de ses caractéristiques textuelles, puis de mesurer la similarité entre films.
-
-    L’intégralité de la phase d’apprentissage est réalisée **en amont (offline)** afin de garantir de bonnes performances dans l’application Streamlit.
-
-    ---
-
-    ### 4.2 Préparation des données pour le ML (en amont)
-
-    À partir de la base nettoyée issue d’IMDB, une table dédiée au Machine Learning est construite (`movies_features.csv.gz`).
-
-    Pour chaque film, on génère une **représentation textuelle unique appelée "soup"**, qui agrège :
-
-    * les genres du film
-    * le réalisateur principal
-    * les acteurs principaux
-
-    Exemple de soup :
-
-    ```
-    Drama Thriller nolan dicaprio hardy
-    ```
-
-    Cette étape est cruciale : elle permet de transformer des données hétérogènes (catégories, noms propres) en une forme exploitable par un modèle NLP simple.
-
-    ---
-
-    ### 4.3 Vectorisation TF-IDF (fit offline)
-
-    Une fois la colonne "soup" construite pour l’ensemble du catalogue :
-
-    1. Un **TF-IDF Vectorizer** est entraîné sur l’intégralité des soups du catalogue
-    2. Chaque film est transformé en un **vecteur numérique** de dimension élevée
-
-    Ce processus produit :
-
-    * une matrice creuse TF-IDF (films × termes)
-    * un vocabulaire pondéré par l’importance des mots
-
-    Les fichiers générés sont :
-
-    * `tfidf_vectorizer.joblib` → le modèle TF-IDF entraîné (fit)
-    * `tfidf_matrix.joblib` → la matrice vectorisée des films
-    * `tconst_index.csv` → mapping entre identifiant IMDb et index de ligne
-
-    Ces artefacts sont sauvegardés sur disque et **ne sont jamais recalculés dans Streamlit**.
-
-    ---
-
-    ### 4.4 Chargement et utilisation dans Streamlit
-
-    Dans l’application :
-
-    * les artefacts sont chargés une seule fois via `st.cache_resource`
-    * la matrice et le vectorizer restent en mémoire pour toutes les sessions
-
-    Deux cas d’usage sont alors possibles.
-
-    ---
-
-    ### 4.5 Recommandation à partir d’un film du catalogue
-
-    Lorsque l’utilisateur sélectionne un film déjà présent dans la base locale :
-
-    1. On récupère son index dans la matrice TF-IDF
-    2. On calcule la **similarité cosinus** entre son vecteur et tous les autres films
-    3. On trie les scores et on retourne les films les plus similaires
-
-    Ce mécanisme est rapide car il s’appuie uniquement sur des calculs matriciels en mémoire.
-
-    ---
-
-    ### 4.6 Recommandation à partir d’un film externe (API TMDB)
-
-    Pour un film **absent du catalogue local** (par exemple issu de la recherche TMDB) :
-
-    1. Les informations du film sont récupérées via l’API TMDB
-    2. Une soup est construite dynamiquement (genres + réalisateur + acteurs)
-    3. Cette soup est **transformée** avec le vectorizer existant (pas de refit)
-    4. Le vecteur obtenu est comparé à la matrice TF-IDF locale via similarité cosinus
-
-    👉 Le modèle n’est jamais réentraîné : on applique uniquement une **transformation** cohérente avec l’apprentissage initial.
-
-    ---
-
-    ### 4.7 Cohérence entre données locales et données API
-
-    Le point clé du système est la **cohérence du pipeline** :
-
-    * même logique de soup
-    * même normalisation (minuscules, espaces)
-    * même vectorizer
-
-    Cela garantit que les films issus de l’API TMDB sont projetés dans **le même espace vectoriel** que les films du catalogue local.
-
-    ---
-
-    ### 4.8 Pourquoi ce choix de modèle
-
-    Ce modèle a été choisi car il :
-
-    * est explicable
-    * ne nécessite pas de données utilisateurs
-    * est rapide et robuste
-    * est parfaitement adapté à un contexte Data Analyst
-
-    Il permet de démontrer une chaîne ML complète sans complexité inutile.
-
-    ---
-
-    ### 4.9 Limites spécifiques du ML
-
-    * Pas de prise en compte des préférences utilisateurs
-    * Sensible à la qualité des métadonnées (genres, casting)
-    * Ne capture pas les relations sémantiques profondes
-
-    ---
-
-    ### 4.10 Évolutions possibles
-
-    * Passage à des embeddings (Word2Vec, SBERT)
-    * Ajout d’un scoring hybride (contenu + popularité)
-    * Intégration de feedback utilisateur
-
-    ### Type de modèle
-
-    * **Content-Based Filtering**
-    * Aucun apprentissage supervisé
-    * Pas de données utilisateur
-
-    ### Méthode
-
-    1. Vectorisation TF-IDF sur la soup
-    2. Calcul de similarité cosinus entre films
-    3. Classement des films les plus proches
-
-    ### Artefacts produits
-
-    * `tfidf_vectorizer.joblib`
-    * `tfidf_matrix.joblib`
-    * `tconst_index.csv`
-
-    Ces fichiers sont chargés **une seule fois** dans Streamlit grâce à `st.cache_resource`.
-
-    ---
-
-    ## 5. Intégration TMDB (enrichissement)
-
-    ### Rôle de TMDB
-
-    * Titres en français
-    * Posters et backdrops
-    * Synopsis
-    * Popularité
-
-    ### Fonctionnement
-
-    * Appels API encapsulés dans `tmdb_client.py`
-    * Cache disque + cache Streamlit
-    * Aucun enrichissement massif au chargement
-
-    ### Principe clé
-
-    👉 **L’enrichissement se fait uniquement à l’affichage** (Top 5 / cartes visibles)
-
-    Cela garantit :
-
-    * Performance
-    * Respect des quotas API
-
-    ---
-
-    ## 6. Reranking et contextualisation
-
-    Pour certains cas (films à l’affiche / à venir) :
-
-    * Construction de sets IMDb `now_playing` / `upcoming`
-    * Permet d’annoter ou prioriser les recommandations
-
-    Ces calculs sont :
-
-    * Mis en cache
-    * Recalculés à intervalle contrôlé (TTL)
-
-    ---
-
-    ## 7. Architecture Streamlit (résumé)
-
-    * **Offline** : nettoyage, feature engineering, ML
-    * **Online (Streamlit)** :
-
-    * Chargement des fichiers finaux
-    * Recommandation en temps réel
-    * Enrichissement visuel à la demande
-
-    Cette séparation garantit :
-
-    * Performance
-    * Reproductibilité
-    * Scalabilité
-
-    ---
-
-    ## 8. Limites identifiées
-
-    * Pas de personnalisation utilisateur
-    * Recommandation basée uniquement sur le contenu
-    * Dépendance partielle à une API externe (TMDB)
-
-    ---
-
-    ## Conclusion
-
-    Le projet met en œuvre une **chaîne complète de data analysis appliquée** :
-
-    * collecte
-    * nettoyage
-    * feature engineering
-    * machine learning
-    * déploiement applicatif
-
-    Le tout dans une architecture **adaptée à un contexte Data Analyst**, claire, performante et justifiable.
-
-
-            """
-        )
+    st.markdown(_load_notes())
     st.markdown(
             """
             # 📊 KPI – Traitement des données
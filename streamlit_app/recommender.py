@@ -2,26 +2,27 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import functools
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, NamedTuple, Optional, Tuple
 
-import joblib
 import numpy as np
-import pandas as pd
 import streamlit as st
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy.sparse import load_npz
 
 
 BASE_DIR = Path(__file__).resolve().parents[1]  # dossier racine final_projet/
 RECO_DIR = BASE_DIR / "data" / "data_processed" / "reco"
 
 
-@dataclass(frozen=True)
-class RecoArtifacts:
+# NamedTuple plutôt que dataclass gelée : accès aux attributs par indexation
+# de tuple en C (pas de passage par __dict__) dans les fonctions chaudes,
+# avec la même immuabilité
+class RecoArtifacts(NamedTuple):
     vectorizer: object
     matrix: object  # matrice sparse (scipy) contenant les vecteurs TF-IDF
-    tconst_list: List[str]
+    matrix_T: object  # transposée en CSR : index inversé feature -> (ligne, poids)
+    tconst_list: np.ndarray  # chaînes à largeur fixe, indexation ligne -> tconst
     tconst_to_row: dict
 
 
@@ -35,25 +36,84 @@ def load_reco_artifacts() -> RecoArtifacts:
     - un mapping tconst -> index de ligne
     Le tout est mis en cache par Streamlit pour éviter les rechargements.
     """
+    # Import local : joblib ne sert qu'à ce chargement unique, inutile de le
+    # payer à l'import du module (démarrage à froid)
+    import joblib
+
     vectorizer = joblib.load(RECO_DIR / "tfidf_vectorizer.joblib")
-    matrix = joblib.load(RECO_DIR / "tfidf_matrix.joblib")
 
-    idx = pd.read_csv(RECO_DIR / "tconst_index.csv")
-    tconst_list = idx["tconst"].astype(str).tolist()
-    tconst_to_row = {t: i for i, t in enumerate(tconst_list)}
+    # Format sparse natif scipy : npz non compressé, data/indices/indptr lus
+    # d'un bloc depuis le zip (pas de pickle ni de décompression). numpy
+    # ignore mmap_mode pour les archives npz, un vrai mmap demanderait des
+    # .npy séparés — le gain restant ne justifie pas de casser le format
+    matrix = load_npz(RECO_DIR / "tfidf_matrix.npz")
+    # Garde-fou : le builder écrit du float32, mais un artefact ancien peut
+    # être en float64 — on caste (no-op si déjà float32) pour garder le SpMV
+    # en simple précision (moitié moins d'octets déplacés par requête)
+    matrix.data = matrix.data.astype(np.float32, copy=False)
+
+    # Transposée en CSR construite une fois : chaque ligne est la posting list
+    # d'une feature, le produit requête @ transposée ne parcourt que les
+    # features présentes dans la requête au lieu de toute la matrice
+    matrix_T = matrix.T.tocsr()
+
+    # Index joblib précalculé dans les deux sens ; repli sur l'ancien CSV
+    # (parsing + reconstruction du dict) s'il est absent
+    index_path = RECO_DIR / "tconst_index.joblib"
+    if index_path.exists():
+        idx = joblib.load(index_path)
+        # Tableau numpy de chaînes à largeur fixe gardé tel quel : un bloc
+        # contigu (indexation par arithmétique de pointeur) au lieu de ~39k
+        # objets str Python reconstruits par .tolist()
+        tconst_list = np.asarray(idx["row_to_tconst"])
+        tconst_to_row = idx["tconst_to_row"]
+    else:
+        # Une colonne de chaînes : un splitlines suffit, pas besoin de la
+        # machinerie pandas pour relire l'ancien format
+        lines = (RECO_DIR / "tconst_index.csv").read_text().splitlines()[1:]
+        tconst_list = np.asarray([line.strip() for line in lines])
+        tconst_to_row = {t: i for i, t in enumerate(tconst_list.tolist())}
 
     return RecoArtifacts(
         vectorizer=vectorizer,
         matrix=matrix,
+        matrix_T=matrix_T,
         tconst_list=tconst_list,
         tconst_to_row=tconst_to_row,
     )
 
 
+def _top_k_from_sparse(scores, top_n: int, exclude_idx: Optional[int] = None) -> List[Tuple[int, float]]:
+    """
+    Extrait les top_n (index de ligne, score) d'un produit 1 x N resté sparse.
+    Seules les lignes partageant au moins une feature avec la requête ont un
+    score non nul : on partitionne directement scores.data (nnz valeurs) au
+    lieu de densifier puis parcourir un vecteur de taille N.
+    """
+    data = scores.data
+    cols = scores.indices
+    if exclude_idx is not None:
+        keep = cols != exclude_idx
+        data = data[keep]
+        cols = cols[keep]
+    if top_n <= 0 or data.size == 0:
+        return []
+
+    # kth scalaire : un seul pivot O(nnz), puis tri du seul petit slice —
+    # passer un range à argpartition forçait un partitionnement par position
+    k = min(top_n, data.size)
+    top = np.argpartition(-data, k - 1)[:k]
+    top = top[np.argsort(-data[top])]
+    return [(int(cols[i]), float(data[i])) for i in top]
+
+
+@st.cache_data(show_spinner=False, max_entries=4096)
 def recommend_by_tconst(query_tconst: str, top_n: int = 10) -> List[Tuple[str, float]]:
     """
     Recommande des films à partir d’un film déjà présent dans le catalogue.
     Retourne une liste de tuples (tconst, score) correspondant aux films les plus similaires.
+    Mémoïsé entre sessions : les artefacts étant immuables, revisiter un film
+    déjà demandé ne refait aucun produit sparse.
     """
     art = load_reco_artifacts()
     if query_tconst not in art.tconst_to_row:
@@ -63,21 +123,49 @@ def recommend_by_tconst(query_tconst: str, top_n: int = 10) -> List[Tuple[str, f
     q_idx = art.tconst_to_row[query_tconst]
     q_vec = art.matrix[q_idx]
 
-    # Similarité cosinus entre le film cible et tous les films du catalogue
-    sims = cosine_similarity(q_vec, art.matrix).ravel()
+    # Les lignes de la matrice sont normalisées L2 à la construction : le
+    # produit requête @ transposée accumule les posting lists des seules
+    # features du film demandé et donne directement la similarité cosinus.
+    # Le résultat reste sparse jusqu'à la sélection du top_n (le film demandé
+    # est écarté par index, plus besoin de mettre sa case à -1)
+    scores = q_vec @ art.matrix_T
+    top = _top_k_from_sparse(scores, top_n, exclude_idx=q_idx)
 
-    # Exclusion du film lui-même (pour éviter qu’il sorte en top 1)
-    sims[q_idx] = -1.0
-
-    # Cas limite
-    if top_n <= 0:
-        return []
+    return [(str(art.tconst_list[i]), s) for i, s in top]
 
-    # Récupération des top_n indices (plus rapides qu’un tri complet)
-    top_idx = np.argpartition(-sims, range(min(top_n, len(sims))))[:top_n]
-    top_idx = top_idx[np.argsort(-sims[top_idx])]
 
-    return [(art.tconst_list[i], float(sims[i])) for i in top_idx]
+def recommend_by_tconsts(query_tconsts: List[str], top_n: int = 10) -> List[List[Tuple[str, float]]]:
+    """
+    Variante batch de recommend_by_tconst : empile les vecteurs des films
+    demandés et fait un seul produit Q @ matrix_T au lieu d'une boucle Python
+    d'appels unitaires (surcoût Python amorti, matmul sparse unique).
+    Retourne une liste alignée sur query_tconsts, avec une liste vide pour
+    les tconst absents du catalogue.
+    """
+    art = load_reco_artifacts()
+    rows = [art.tconst_to_row.get(t) for t in query_tconsts]
+    known = [r for r in rows if r is not None]
+    if not known or top_n <= 0:
+        return [[] for _ in query_tconsts]
+
+    # Indexation directe des lignes (déjà normalisées L2) : une matrice de
+    # requêtes B x V, puis un seul produit B x N
+    Q = art.matrix[known]
+    sims = (Q @ art.matrix_T).toarray()
+
+    results_by_row = {}
+    k = min(top_n, sims.shape[1] - 1)
+    for out_i, q_idx in enumerate(known):
+        s = sims[out_i]
+        s[q_idx] = -1.0  # pas d'auto-recommandation
+        top = np.argpartition(-s, k - 1)[:k]
+        top = top[np.argsort(-s[top])]
+        # même contrat que le chemin unitaire : pas de remplissage à score nul
+        results_by_row[q_idx] = [
+            (str(art.tconst_list[i]), float(s[i])) for i in top if s[i] > 0.0
+        ]
+
+    return [results_by_row[r] if r is not None else [] for r in rows]
 
 
 def recommend_by_soup(query_soup: str, top_n: int = 10) -> List[Tuple[str, float]]:
@@ -87,19 +175,33 @@ def recommend_by_soup(query_soup: str, top_n: int = 10) -> List[Tuple[str, float
     Le texte est vectorisé avec le TF-IDF déjà entraîné (pas de refit),
     puis comparé à la matrice du catalogue via similarité cosinus.
     """
-    art = load_reco_artifacts()
     query_soup = (query_soup or "").strip().lower()
     if not query_soup:
         return []
+    return _recommend_by_soup_cached(query_soup, top_n)
+
+
+# lru_cache borné plutôt que st.cache_data : le texte vient de l'extérieur
+# (TMDB), une clé par soup normalisée avec éviction LRU évite de laisser
+# grossir un cache Streamlit sur des requêtes arbitraires
+@functools.lru_cache(maxsize=2048)
+def _recommend_by_soup_cached(query_soup: str, top_n: int) -> List[Tuple[str, float]]:
+    art = load_reco_artifacts()
 
     # Vectorisation du texte d’entrée avec le vectorizer TF-IDF existant
     q_vec = art.vectorizer.transform([query_soup])
 
-    # Similarité cosinus entre le film externe et tous les films du catalogue
-    sims = cosine_similarity(q_vec, art.matrix).ravel()
+    # Vecteur nul (aucun token extractible : ponctuation, chaîne vide après
+    # nettoyage) : le produit renverrait des scores tous nuls, on
+    # court-circuite. NB : le vectorizer par hachage n'a pas de notion de
+    # token « inconnu », un mot hors corpus tombe quand même dans un bucket
+    if q_vec.nnz == 0:
+        return []
 
-    # Sélection des top_n films les plus similaires
-    top_idx = np.argpartition(-sims, range(min(top_n, len(sims))))[:top_n]
-    top_idx = top_idx[np.argsort(-sims[top_idx])]
+    # Requête normalisée par le pipeline, matrice normalisée à la construction :
+    # accumulation des posting lists des features de la requête = cosinus.
+    # Produit gardé sparse jusqu'au top_n (voir _top_k_from_sparse)
+    scores = q_vec @ art.matrix_T
+    top = _top_k_from_sparse(scores, top_n)
 
-    return [(art.tconst_list[i], float(sims[i])) for i in top_idx]
+    return [(str(art.tconst_list[i]), s) for i, s in top]
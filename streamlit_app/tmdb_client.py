@@ -20,14 +20,27 @@
 
 from __future__ import annotations
 
-import json
+import functools
+import os
+import sqlite3
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # dépendance optionnelle : repli sur requests
+    httpx = None
 
 
 # -----------------------------
@@ -45,6 +58,7 @@ CACHE_DIR.mkdir(parents=True, exist_ok=True)
 CACHE_NOW_PLAYING = CACHE_DIR / "now_playing_fr.json"
 CACHE_UPCOMING = CACHE_DIR / "upcoming_fr.json"
 CACHE_BUNDLES = CACHE_DIR / "bundles_by_tmdb_id.json"  # details+credits+external_ids by tmdb_id
+CACHE_BUNDLES_DB = CACHE_DIR / "bundles.sqlite"  # current bundle store (one row per movie)
 
 # TTL in seconds
 TTL_LISTS = 6 * 3600          # 6 hours for now/upcoming
@@ -67,25 +81,81 @@ class TMDBError(RuntimeError):
 # -----------------------------
 # Secrets / HTTP helpers
 # -----------------------------
+# Clé lue une seule fois : st.secrets reparse ses sources à chaque accès,
+# inutile de payer ça à chaque requête. Injectée dans les params de la
+# session au premier appel (mergés automatiquement à chaque GET).
+_API_KEY: Optional[str] = None
+
+
 def _get_api_key() -> str:
-    key = st.secrets.get("TMDB_API_KEY", "")
-    if not key:
-        raise TMDBError(
-            "TMDB_API_KEY missing. Add it to .streamlit/secrets.toml or Streamlit Cloud Secrets."
+    global _API_KEY
+    if _API_KEY is None:
+        key = st.secrets.get("TMDB_API_KEY", "")
+        if not key:
+            raise TMDBError(
+                "TMDB_API_KEY missing. Add it to .streamlit/secrets.toml or Streamlit Cloud Secrets."
+            )
+        _API_KEY = str(key)
+        _SESSION.params["api_key"] = _API_KEY
+    return _API_KEY
+
+
+# Shared session: keeps TCP/TLS connections alive between calls instead of a
+# full DNS + handshake per request (requests.get builds a throwaway session
+# each time). Pool sized for the thread fan-out below.
+# Retries au niveau transport : erreurs transitoires (429 et 5xx) rejouées
+# avec backoff exponentiel, en respectant le Retry-After envoyé par TMDB
+# lors d'un rate-limit — GET uniquement, idempotent
+_RETRY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    respect_retry_after_header=True,
+)
+
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_RETRY))
+# Headers explicites : réponses compressées (gzip suffit, pas de br sans
+# décodeur installé), connexion maintenue, et un User-Agent identifiable
+# plutôt que le python-requests générique
+_SESSION.headers.update(
+    {
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+        "User-Agent": "final-projet-streamlit/1.0",
+    }
+)
+
+# Worker pool for fan-out requests (list/search pages fetched concurrently)
+_HTTP_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tmdb")
+
+# Client HTTP/2 pour les fan-out : les requêtes simultanées sont multiplexées
+# sur une seule connexion TLS au lieu d'en ouvrir une par thread du pool.
+# Optionnel (httpx + h2) : _HTTP2_CLIENT reste None sans eux et le fan-out
+# repasse par la session requests
+_HTTP2_CLIENT = None
+if httpx is not None:
+    try:
+        _HTTP2_CLIENT = httpx.Client(
+            base_url=TMDB_BASE,
+            http2=True,
+            timeout=20,
+            headers={"Accept": "application/json", "User-Agent": "final-projet-streamlit/1.0"},
         )
-    return str(key)
+    except ImportError:  # h2 absent
+        _HTTP2_CLIENT = None
 
 
 def _request_json(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Perform a GET request to TMDB with basic error handling.
     """
-    api_key = _get_api_key()
+    _get_api_key()  # garantit api_key dans les params de la session
     url = f"{TMDB_BASE}{path}"
-    p = dict(params or {})
-    p["api_key"] = api_key
 
-    r = requests.get(url, params=p, timeout=20)
+    r = _SESSION.get(url, params=params, timeout=20)
     if r.status_code != 200:
         # Try to extract message
         try:
@@ -97,6 +167,34 @@ def _request_json(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[st
     return r.json()
 
 
+def _request_json_many(path: str, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Perform several GETs on the same endpoint concurrently (one per params
+    dict). Results come back in the same order as params_list; any failure
+    propagates as TMDBError, like the sequential path.
+    """
+    if len(params_list) == 1:
+        return [_request_json(path, params=params_list[0])]
+    if _HTTP2_CLIENT is None:
+        return list(_HTTP_POOL.map(lambda p: _request_json(path, params=p), params_list))
+
+    api_key = _get_api_key()
+
+    def _one(params: Dict[str, Any]) -> Dict[str, Any]:
+        p = dict(params or {})
+        p["api_key"] = api_key
+        r = _HTTP2_CLIENT.get(path, params=p)
+        if r.status_code != 200:
+            try:
+                msg = r.json()
+            except Exception:
+                msg = r.text
+            raise TMDBError(f"TMDB request failed ({r.status_code}) for {path}: {msg}")
+        return r.json()
+
+    return list(_HTTP_POOL.map(_one, params_list))
+
+
 # -----------------------------
 # Disk cache helpers
 # -----------------------------
@@ -104,42 +202,120 @@ def _read_cache(path: Path) -> Optional[Dict[str, Any]]:
     if not path.exists():
         return None
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return orjson.loads(path.read_bytes())
     except Exception:
         return None
 
 
 def _write_cache(path: Path, data: Dict[str, Any]) -> None:
+    # orjson: (dé)sérialisation en C, sortie compacte (l'indentation ne
+    # servait à rien pour un cache et grossissait les fichiers).
+    # Écriture atomique : fichier temporaire voisin puis os.replace, un
+    # lecteur concurrent (ou un crash en pleine écriture) voit toujours
+    # l'ancienne version complète, jamais un JSON tronqué
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(orjson.dumps(data))
+    os.replace(tmp, path)
 
 
 def _is_fresh(ts: float, ttl: int) -> bool:
     return (time.time() - ts) <= ttl
 
 def _bundle_path_for_tmdb_id(tmdb_id: int) -> Path:
+    # Legacy one-file-per-movie layout, kept read-only for migration
     return CACHE_DIR / f"bundle_tmdb_{int(tmdb_id)}.json"
 
 
-def _read_bundle_file(tmdb_id: int) -> Optional[Dict[str, Any]]:
-    p = _bundle_path_for_tmdb_id(tmdb_id)
-    data = _read_cache(p)
-    if not data:
-        return None
-    if not _is_fresh(float(data.get("_ts", 0)), TTL_BUNDLES):
-        return None
-    return data
+# -----------------------------
+# Bundle store (SQLite)
+# -----------------------------
+# One row per movie instead of one JSON file per movie: a lookup is a single
+# indexed read (no open/stat/full parse per file), writes touch one row, and
+# WAL lets reads proceed while a write is in flight.
+_DB_LOCK = threading.Lock()
+_DB_CONN: Optional[sqlite3.Connection] = None
+
+
+def _bundles_db() -> sqlite3.Connection:
+    global _DB_CONN
+    with _DB_LOCK:
+        if _DB_CONN is None:
+            conn = sqlite3.connect(CACHE_BUNDLES_DB, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS bundles ("
+                "tmdb_id INTEGER PRIMARY KEY, ts REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+            conn.commit()
+            _DB_CONN = conn
+    return _DB_CONN
+
 
+def _pack_bundle(bundle: Dict[str, Any]) -> bytes:
+    # Payloads compressés dans le store (~4-5x plus petits) : moins d'octets
+    # lus par lookup et une base qui tient dans le cache de pages
+    return zlib.compress(orjson.dumps(bundle), 6)
 
-def _write_bundle_file(tmdb_id: int, bundle: Dict[str, Any]) -> None:
-    p = _bundle_path_for_tmdb_id(tmdb_id)
-    _write_cache(p, bundle)
+
+def _unpack_bundle(raw: Any) -> Dict[str, Any]:
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    # En-tête zlib 0x78 ; un JSON brut (anciennes lignes) commence par '{'
+    if raw[:1] == b"\x78":
+        raw = zlib.decompress(raw)
+    return orjson.loads(raw)
+
+
+def _read_bundle(tmdb_id: int) -> Optional[Dict[str, Any]]:
+    conn = _bundles_db()
+    with _DB_LOCK:
+        row = conn.execute(
+            "SELECT ts, payload FROM bundles WHERE tmdb_id = ?", (int(tmdb_id),)
+        ).fetchone()
+    if row is not None and _is_fresh(float(row[0]), TTL_BUNDLES):
+        return _unpack_bundle(row[1])
+
+    # Migration: fall back to the legacy per-movie file, and move it into
+    # the store so the next read is a pure SQLite hit
+    data = _read_cache(_bundle_path_for_tmdb_id(tmdb_id))
+    if data and _is_fresh(float(data.get("_ts", 0)), TTL_BUNDLES):
+        _write_bundle(tmdb_id, data)
+        return data
+    return None
+
+
+def _write_bundle(tmdb_id: int, bundle: Dict[str, Any]) -> None:
+    _write_bundles_many({int(tmdb_id): bundle})
+
+
+def _write_bundles_many(bundles: Dict[int, Dict[str, Any]]) -> None:
+    """
+    Upsert several bundles in a single transaction (executemany): one fsync
+    for the whole batch instead of one per movie.
+    """
+    if not bundles:
+        return
+    rows = [
+        (int(tid), float(b.get("_ts") or time.time()), _pack_bundle(b))
+        for tid, b in bundles.items()
+    ]
+    conn = _bundles_db()
+    with _DB_LOCK:
+        conn.executemany(
+            "INSERT OR REPLACE INTO bundles (tmdb_id, ts, payload) VALUES (?, ?, ?)", rows
+        )
+        conn.commit()
 
 
 # -----------------------------
 # Data models
 # -----------------------------
-@dataclass(frozen=True)
+# slots=True : pas de __dict__ par instance (objets plus compacts, accès aux
+# attributs plus direct) — sensible sur les listes et filmographies qui en
+# matérialisent des centaines
+@dataclass(frozen=True, slots=True)
 class TMDBListItem:
     tmdb_id: int
     title: str
@@ -152,7 +328,7 @@ class TMDBListItem:
     popularity: Optional[float]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TMDBBundle:
     tmdb_id: int
     details: Dict[str, Any]
@@ -160,91 +336,119 @@ class TMDBBundle:
     external_ids: Dict[str, Any]
 
 
+def _prefetch_bundles_async(items: List[TMDBListItem]) -> None:
+    """
+    Préchauffage fire-and-forget : quand une liste vient d'être rafraîchie
+    depuis le réseau, les bundles de ses films (ce que coûte le clic suivant
+    sur une fiche) se chargent en arrière-plan pendant que la page s'affiche.
+    Les erreurs sont avalées, le clic retombera sur le chemin normal.
+    """
+
+    def _warm(tmdb_id: int) -> None:
+        try:
+            _get_bundle_cached(tmdb_id)
+        except Exception:
+            pass
+
+    for it in items:
+        _HTTP_POOL.submit(_warm, it.tmdb_id)
+
+
 # -----------------------------
 # Public: Now Playing / Upcoming
 # -----------------------------
+def _item_from_raw(r: Dict[str, Any]) -> TMDBListItem:
+    # Single constructor for raw TMDB movie dicts (list results, person
+    # credits); positional args skip the per-field keyword matching
+    get = r.get
+    return TMDBListItem(
+        int(get("id")),
+        str(get("title") or get("name") or ""),
+        str(get("overview") or ""),
+        get("poster_path"),
+        get("backdrop_path"),
+        get("release_date"),
+        get("vote_average"),
+        get("vote_count"),
+        get("popularity"),
+    )
+
+
 def _parse_list_results(payload: Dict[str, Any]) -> List[TMDBListItem]:
-    items: List[TMDBListItem] = []
-    for r in payload.get("results", []):
-        items.append(
-            TMDBListItem(
-                tmdb_id=int(r.get("id")),
-                title=str(r.get("title") or r.get("name") or ""),
-                overview=str(r.get("overview") or ""),
-                poster_path=r.get("poster_path"),
-                backdrop_path=r.get("backdrop_path"),
-                release_date=r.get("release_date"),
-                vote_average=r.get("vote_average"),
-                vote_count=r.get("vote_count"),
-                popularity=r.get("popularity"),
-            )
-        )
-    return items
+    return [_item_from_raw(r) for r in payload.get("results", ())]
 
-@st.cache_data(ttl=TTL_NOW_PLAYING, show_spinner=False)
 def get_now_playing_fr(pages: int = 1, use_cache: bool = True) -> List[TMDBListItem]:
     """
     Fetch now playing movies in FR language/region.
     pages=1 usually enough (20 items). Increase if needed.
+
+    Not wrapped in st.cache_data: the TTL'd disk cache below is the single
+    caching layer here, callers that want an in-memory memo add their own
+    (see pages_demo.load_now_upcoming_lists). Stacking both meant the same
+    payload was cached twice with two different expiries.
     """
     if use_cache:
         cached = _read_cache(CACHE_NOW_PLAYING)
         if cached and _is_fresh(cached.get("_ts", 0), TTL_NOW_PLAYING):
             return _parse_list_results(cached["payload"])
 
-    # Fetch pages and merge results
+    # Fetch all pages concurrently, then merge in page order
+    pages_params = [
+        {"language": LANG_FR, "region": REGION_FR, "page": page}
+        for page in range(1, max(1, pages) + 1)
+    ]
     merged_payload: Dict[str, Any] = {"results": []}
-    for page in range(1, max(1, pages) + 1):
-        payload = _request_json(
-            "/movie/now_playing",
-            params={"language": LANG_FR, "region": REGION_FR, "page": page},
-        )
+    for payload in _request_json_many("/movie/now_playing", pages_params):
         merged_payload["results"].extend(payload.get("results", []))
 
     if use_cache:
         _write_cache(CACHE_NOW_PLAYING, {"_ts": time.time(), "payload": merged_payload})
 
-    return _parse_list_results(merged_payload)
+    items = _parse_list_results(merged_payload)
+    _prefetch_bundles_async(items)
+    return items
 
-@st.cache_data(ttl=TTL_UPCOMING, show_spinner=False)
 def get_upcoming_fr(pages: int = 1, use_cache: bool = True) -> List[TMDBListItem]:
     """
     Fetch upcoming movies in FR language/region.
+    Same caching contract as get_now_playing_fr (disk cache only).
     """
     if use_cache:
         cached = _read_cache(CACHE_UPCOMING)
         if cached and _is_fresh(cached.get("_ts", 0), TTL_UPCOMING):
             return _parse_list_results(cached["payload"])
 
+    pages_params = [
+        {"language": LANG_FR, "region": REGION_FR, "page": page}
+        for page in range(1, max(1, pages) + 1)
+    ]
     merged_payload: Dict[str, Any] = {"results": []}
-    for page in range(1, max(1, pages) + 1):
-        payload = _request_json(
-            "/movie/upcoming",
-            params={"language": LANG_FR, "region": REGION_FR, "page": page},
-        )
+    for payload in _request_json_many("/movie/upcoming", pages_params):
         merged_payload["results"].extend(payload.get("results", []))
 
     if use_cache:
         _write_cache(CACHE_UPCOMING, {"_ts": time.time(), "payload": merged_payload})
 
-    return _parse_list_results(merged_payload)
+    items = _parse_list_results(merged_payload)
+    _prefetch_bundles_async(items)
+    return items
 
 
 # -----------------------------
 # Public: Details / Credits / External IDs (cached bundle)
 # -----------------------------
+# lru_cache(1) : le store global hérité est en lecture seule, le parser une
+# fois par processus suffit — chaque miss froid relisait tout le fichier
+@functools.lru_cache(maxsize=1)
 def _load_bundles_store() -> Dict[str, Any]:
+    # Legacy global store, read-only: new bundles only go to SQLite. It used
+    # to be rewritten in full (every bundle re-serialized) on each cache miss.
     store = _read_cache(CACHE_BUNDLES)
     if not store or "items" not in store:
         return {"_ts": time.time(), "items": {}}
     return store
 
 
-def _save_bundles_store(store: Dict[str, Any]) -> None:
-    store["_ts"] = time.time()
-    _write_cache(CACHE_BUNDLES, store)
-
-
 def get_movie_details_fr(tmdb_id: int) -> Dict[str, Any]:
     return _request_json(f"/movie/{tmdb_id}", params={"language": LANG_FR})
 
@@ -257,50 +461,60 @@ def get_movie_external_ids(tmdb_id: int) -> Dict[str, Any]:
     return _request_json(f"/movie/{tmdb_id}/external_ids", params={})
 
 
-@st.cache_data(ttl=TTL_BUNDLES, show_spinner=False)
-def get_tmdb_details_bundle(tmdb_id: int, use_cache: bool = True) -> TMDBBundle:
-    tmdb_id = int(tmdb_id)
+def _fetch_bundle(tmdb_id: int, write_cache: bool) -> TMDBBundle:
+    # append_to_response : détails + crédits + external_ids en un seul
+    # aller-retour au lieu de trois (les getters unitaires restent
+    # disponibles pour les appels ciblés)
+    payload = _request_json(
+        f"/movie/{tmdb_id}",
+        params={"language": LANG_FR, "append_to_response": "credits,external_ids"},
+    )
+    credits = payload.pop("credits", None) or {}
+    external_ids = payload.pop("external_ids", None) or {}
+    details = payload
 
-    # 1) Cache disque "1 fichier par film"
-    if use_cache:
-        cached_file = _read_bundle_file(tmdb_id)
-        if cached_file:
-            return TMDBBundle(
-                tmdb_id=tmdb_id,
-                details=cached_file["details"],
-                credits=cached_file["credits"],
-                external_ids=cached_file["external_ids"],
-            )
+    if write_cache:
+        bundle = {"_ts": time.time(), "details": details, "credits": credits, "external_ids": external_ids}
+        _write_bundle(tmdb_id, bundle)
 
-    # 2) Fallback: ancien store global
-    tmdb_id_str = str(tmdb_id)
-    if use_cache:
-        store = _load_bundles_store()
-        item = store["items"].get(tmdb_id_str)
-        if item and _is_fresh(item.get("_ts", 0), TTL_BUNDLES):
-            # écriture opportuniste en fichier par film
-            _write_bundle_file(tmdb_id, item)
-            return TMDBBundle(
-                tmdb_id=tmdb_id,
-                details=item["details"],
-                credits=item["credits"],
-                external_ids=item["external_ids"],
-            )
+    return TMDBBundle(tmdb_id=tmdb_id, details=details, credits=credits, external_ids=external_ids)
 
-    details = get_movie_details_fr(tmdb_id)
-    credits = get_movie_credits(tmdb_id)
-    external_ids = get_movie_external_ids(tmdb_id)
 
-    bundle = {"_ts": time.time(), "details": details, "credits": credits, "external_ids": external_ids}
+# Mémo en mémoire devant le store disque : redemander un film déjà vu dans
+# la session ne refait ni requête SQLite ni parse JSON, juste un lookup dict
+@functools.lru_cache(maxsize=4096)
+def _get_bundle_cached(tmdb_id: int) -> TMDBBundle:
+    # 1) Store SQLite (migration des anciens fichiers incluse)
+    cached = _read_bundle(tmdb_id)
+    if cached:
+        return TMDBBundle(
+            tmdb_id=tmdb_id,
+            details=cached["details"],
+            credits=cached["credits"],
+            external_ids=cached["external_ids"],
+        )
 
-    if use_cache:
-        # save both (file + global store for backward compatibility)
-        _write_bundle_file(tmdb_id, bundle)
-        store = _load_bundles_store()
-        store["items"][tmdb_id_str] = bundle
-        _save_bundles_store(store)
+    # 2) Fallback: ancien store global (lecture seule)
+    item = _load_bundles_store()["items"].get(str(tmdb_id))
+    if item and _is_fresh(item.get("_ts", 0), TTL_BUNDLES):
+        # écriture opportuniste dans le store SQLite
+        _write_bundle(tmdb_id, item)
+        return TMDBBundle(
+            tmdb_id=tmdb_id,
+            details=item["details"],
+            credits=item["credits"],
+            external_ids=item["external_ids"],
+        )
+
+    return _fetch_bundle(tmdb_id, write_cache=True)
 
-    return TMDBBundle(tmdb_id=tmdb_id, details=details, credits=credits, external_ids=external_ids)
+
+@st.cache_data(ttl=TTL_BUNDLES, show_spinner=False, max_entries=2048)
+def get_tmdb_details_bundle(tmdb_id: int, use_cache: bool = True) -> TMDBBundle:
+    tmdb_id = int(tmdb_id)
+    if not use_cache:
+        return _fetch_bundle(tmdb_id, write_cache=False)
+    return _get_bundle_cached(tmdb_id)
 
 
 
@@ -308,32 +522,30 @@ def get_tmdb_details_bundle(tmdb_id: int, use_cache: bool = True) -> TMDBBundle:
 # Helpers: Build soup + mapping + display record
 # -----------------------------
 def _extract_genre_names(details: Dict[str, Any]) -> List[str]:
-    genres = details.get("genres") or []
-    out = []
-    for g in genres:
-        name = g.get("name")
-        if name:
-            out.append(str(name))
-    return out
+    return [str(g["name"]) for g in details.get("genres") or () if g.get("name")]
 
 
 def _extract_director_name(credits: Dict[str, Any]) -> str:
-    crew = credits.get("crew") or []
-    # First director
-    for c in crew:
-        if str(c.get("job", "")).lower() == "director":
-            return str(c.get("name", "")).strip()
-    return ""
+    # First director; "Director" is the canonical TMDB job string, an exact
+    # comparison avoids a str() + lower() per crew member
+    return next(
+        (
+            str(c["name"]).strip()
+            for c in credits.get("crew") or ()
+            if c.get("job") == "Director" and c.get("name")
+        ),
+        "",
+    )
 
 
 def _extract_cast_top_n(credits: Dict[str, Any], n: int = 5) -> List[str]:
-    cast = credits.get("cast") or []
-    names: List[str] = []
-    for c in cast[: max(0, n)]:
-        nm = str(c.get("name", "")).strip()
-        if nm:
-            names.append(nm)
-    return names
+    names = (str(c.get("name", "")).strip() for c in (credits.get("cast") or [])[: max(0, n)])
+    return [nm for nm in names if nm]
+
+
+# Table précompilée pour les séparateurs à neutraliser : un seul passage
+# translate sur la chaîne assemblée au lieu d'un replace par morceau
+_SOUP_TRANS = str.maketrans(",|", "  ")
 
 
 def build_soup_from_tmdb_bundle(bundle: TMDBBundle, cast_top_n: int = 5) -> str:
@@ -345,14 +557,8 @@ def build_soup_from_tmdb_bundle(bundle: TMDBBundle, cast_top_n: int = 5) -> str:
     director = _extract_director_name(bundle.credits)
     cast = _extract_cast_top_n(bundle.credits, n=cast_top_n)
 
-    parts = [
-        " ".join(genre_names).replace(",", " "),
-        director.replace("|", " "),
-        " ".join(cast).replace("|", " "),
-    ]
-    soup = " ".join(parts).strip().lower()
-    soup = " ".join(soup.split())
-    return soup
+    soup = " ".join((*genre_names, director, *cast)).translate(_SOUP_TRANS).lower()
+    return " ".join(soup.split())
 
 
 def tmdb_bundle_to_imdb_id(bundle: TMDBBundle) -> str:
@@ -409,24 +615,23 @@ def build_now_upcoming_imdb_id_sets(pages_now: int = 1, pages_upcoming: int = 1)
     now_items = get_now_playing_fr(pages=pages_now, use_cache=True)
     up_items = get_upcoming_fr(pages=pages_upcoming, use_cache=True)
 
-    now_imdb_ids = set()
-    up_imdb_ids = set()
-
-    for it in now_items:
-        b = get_tmdb_details_bundle(it.tmdb_id, use_cache=True)
-        imdb_id = tmdb_bundle_to_imdb_id(b)
-        if imdb_id:
-            now_imdb_ids.add(imdb_id)
-
-    for it in up_items:
-        b = get_tmdb_details_bundle(it.tmdb_id, use_cache=True)
-        imdb_id = tmdb_bundle_to_imdb_id(b)
-        if imdb_id:
-            up_imdb_ids.add(imdb_id)
+    # Hydrate all bundles concurrently: on a cold cache the sequential loop
+    # paid one network round-trip per movie (~40 of them); cached bundles
+    # return instantly either way.
+    def _imdb_ids_for(items: List[TMDBListItem]) -> set:
+        bundles = _HTTP_POOL.map(
+            lambda it: get_tmdb_details_bundle(it.tmdb_id, use_cache=True), items
+        )
+        ids = set()
+        for b in bundles:
+            imdb_id = tmdb_bundle_to_imdb_id(b)
+            if imdb_id:
+                ids.add(imdb_id)
+        return ids
 
-    return now_imdb_ids, up_imdb_ids
+    return _imdb_ids_for(now_items), _imdb_ids_for(up_items)
 
-@st.cache_data(ttl=TTL_FIND_IMDB, show_spinner=False)
+@st.cache_data(ttl=TTL_FIND_IMDB, show_spinner=False, max_entries=1024)
 def find_tmdb_id_by_imdb_id(imdb_id: str) -> Optional[int]:
     """
     Map an IMDb id (tt...) to a TMDB movie id using /find.
@@ -445,7 +650,7 @@ def find_tmdb_id_by_imdb_id(imdb_id: str) -> Optional[int]:
         return None
     return int(results[0].get("id"))
 
-@st.cache_data(ttl=TTL_BUNDLES, show_spinner=False)
+@st.cache_data(ttl=TTL_BUNDLES, show_spinner=False, max_entries=1024)
 def get_or_fetch_bundle_by_imdb_id(imdb_id: str, use_cache: bool = True) -> Optional[TMDBBundle]:
     """
     Convenience helper: imdb_id -> tmdb_id -> bundle
@@ -455,21 +660,21 @@ def get_or_fetch_bundle_by_imdb_id(imdb_id: str, use_cache: bool = True) -> Opti
         return None
     return get_tmdb_details_bundle(tmdb_id, use_cache=use_cache)
 
-@st.cache_data(ttl=TTL_SEARCH, show_spinner=False)
+@st.cache_data(ttl=TTL_SEARCH, show_spinner=False, max_entries=256)
 def search_movie_fr(query: str, pages: int = 1) -> List[TMDBListItem]:
     query = (query or "").strip()
     if not query:
         return []
+    pages_params = [
+        {"language": LANG_FR, "region": REGION_FR, "query": query, "page": page, "include_adult": False}
+        for page in range(1, max(1, pages) + 1)
+    ]
     merged_payload: Dict[str, Any] = {"results": []}
-    for page in range(1, max(1, pages) + 1):
-        payload = _request_json(
-            "/search/movie",
-            params={"language": LANG_FR, "region": REGION_FR, "query": query, "page": page, "include_adult": False},
-        )
+    for payload in _request_json_many("/search/movie", pages_params):
         merged_payload["results"].extend(payload.get("results", []))
     return _parse_list_results(merged_payload)
 
-@st.cache_data(ttl=TTL_SEARCH, show_spinner=False)
+@st.cache_data(ttl=TTL_SEARCH, show_spinner=False, max_entries=256)
 def search_person_fr(query: str, pages: int = 1) -> List[Dict[str, Any]]:
     """
     Search a person, returns raw TMDB payload items (need credit lookup after).
@@ -477,32 +682,17 @@ def search_person_fr(query: str, pages: int = 1) -> List[Dict[str, Any]]:
     query = (query or "").strip()
     if not query:
         return []
+    pages_params = [
+        {"language": LANG_FR, "query": query, "page": page, "include_adult": False}
+        for page in range(1, max(1, pages) + 1)
+    ]
     merged: List[Dict[str, Any]] = []
-    for page in range(1, max(1, pages) + 1):
-        payload = _request_json(
-            "/search/person",
-            params={"language": LANG_FR, "query": query, "page": page, "include_adult": False},
-        )
+    for payload in _request_json_many("/search/person", pages_params):
         merged.extend(payload.get("results", []))
     return merged
 
-@st.cache_data(ttl=TTL_PERSON_CREDITS, show_spinner=False)
+@st.cache_data(ttl=TTL_PERSON_CREDITS, show_spinner=False, max_entries=256)
 def get_person_movie_credits(person_id: int) -> List[TMDBListItem]:
     payload = _request_json(f"/person/{person_id}/movie_credits", params={"language": LANG_FR})
     # payload contains "cast" + "crew". For actor search: use "cast"
-    items: List[TMDBListItem] = []
-    for r in payload.get("cast", [])[:200]:
-        items.append(
-            TMDBListItem(
-                tmdb_id=int(r.get("id")),
-                title=str(r.get("title") or ""),
-                overview=str(r.get("overview") or ""),
-                poster_path=r.get("poster_path"),
-                backdrop_path=r.get("backdrop_path"),
-                release_date=r.get("release_date"),
-                vote_average=r.get("vote_average"),
-                vote_count=r.get("vote_count"),
-                popularity=r.get("popularity"),
-            )
-        )
-    return items
+    return [_item_from_raw(r) for r in payload.get("cast", [])[:200]]